@@ -1,8 +1,16 @@
 import os
+import time
+import asyncio
 import httpx
 from dotenv import load_dotenv
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Optional, List
+
+from cache import PersistentCache, TTLCache, file_lock
+from currency import convert_response, rates
+from deadline import REQUEST_TIMEOUT, deadline_scope, gather_within_deadline, request_timeout
+from logs import log_upstream
+from scheduler import MAX_IN_FLIGHT, PRIORITY_BACKGROUND, SchedulerOverloaded, scheduler
 
 # -------------------------------------------------
 # Load environment variables
@@ -13,30 +21,112 @@ load_dotenv(env_path)
 CLIENT_ID = os.getenv("AMADEUS_CLIENT_ID")
 CLIENT_SECRET = os.getenv("AMADEUS_CLIENT_SECRET")
 
-TOKEN_URL = "https://test.api.amadeus.com/v1/security/oauth2/token"
+# Point at a local stand-in (see amadeus_stub.py) for load tests
+BASE_URL = os.getenv("AMADEUS_BASE_URL", "https://test.api.amadeus.com").rstrip("/")
+
+TOKEN_URL = f"{BASE_URL}/v1/security/oauth2/token"
 
 # -------------------------------------------------
 # API URLs
 # -------------------------------------------------
-FLIGHT_OFFERS_URL = "https://test.api.amadeus.com/v2/shopping/flight-offers"
-FLIGHT_PRICING_URL = "https://test.api.amadeus.com/v1/shopping/flight-offers/pricing"
-SEATMAP_URL = "https://test.api.amadeus.com/v1/shopping/seatmaps"
-FLIGHT_ORDER_URL = "https://test.api.amadeus.com/v1/booking/flight-orders"
+FLIGHT_OFFERS_URL = f"{BASE_URL}/v2/shopping/flight-offers"
+FLIGHT_PRICING_URL = f"{BASE_URL}/v1/shopping/flight-offers/pricing"
+SEATMAP_URL = f"{BASE_URL}/v1/shopping/seatmaps"
+FLIGHT_ORDER_URL = f"{BASE_URL}/v1/booking/flight-orders"
+
+FLIGHT_INSPIRATION_URL = f"{BASE_URL}/v1/shopping/flight-destinations"
+CHEAPEST_DATE_URL = f"{BASE_URL}/v1/shopping/flight-dates"
+AVAILABILITY_URL = f"{BASE_URL}/v1/shopping/availability/flight-availabilities"
+
+FLIGHT_STATUS_URL = f"{BASE_URL}/v2/schedule/flights"
+CHECKIN_LINKS_URL = f"{BASE_URL}/v2/reference-data/urls/checkin-links"
+AIRLINE_LOOKUP_URL = f"{BASE_URL}/v1/reference-data/airlines"
+
+# -------------------------------------------------
+# Shared state
+# -------------------------------------------------
+# SQLite file holding the OAuth token and the second-level response
+# cache. It survives restarts and is shared by every process on the
+# host pointing at the same path. Set AMADEUS_SHARED_STATE_DB="" to
+# keep everything in process memory.
+SHARED_STATE_DB = os.getenv(
+    "AMADEUS_SHARED_STATE_DB",
+    str(Path(__file__).resolve().parent / "shared_state.db"),
+)
+
+_shared_state = PersistentCache(SHARED_STATE_DB) if SHARED_STATE_DB else None
+
+# Reference data (airlines, cities, routes, check-in links) changes rarely
+REFERENCE_CACHE_TTL = 24 * 60 * 60
+
+_reference_cache = TTLCache(ttl=REFERENCE_CACHE_TTL, max_entries=4096)
+
+# Queries known to come back empty or rejected are answered from memory
+# for a short while instead of being re-sent. 401/403/429 and 5xx are
+# transient and never cached.
+NEGATIVE_CACHE_TTL = float(os.getenv("AMADEUS_NEGATIVE_CACHE_TTL", "120"))
+NEGATIVE_CACHE_STATUSES = {400, 404, 422}
+
+_negative_cache = TTLCache(ttl=NEGATIVE_CACHE_TTL, max_entries=2048)
+
+# -------------------------------------------------
+# HTTP client
+# -------------------------------------------------
+# One pooled client per event loop keeps connections (and TLS sessions)
+# open between requests
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=MAX_IN_FLIGHT,
+                max_keepalive_connections=MAX_IN_FLIGHT,
+            ),
+        )
+        _http_client_loop = loop
+    return _http_client
 
-FLIGHT_INSPIRATION_URL = "https://test.api.amadeus.com/v1/shopping/flight-destinations"
-CHEAPEST_DATE_URL = "https://test.api.amadeus.com/v1/shopping/flight-dates"
-AVAILABILITY_URL = "https://test.api.amadeus.com/v1/shopping/availability/flight-availabilities"
 
-FLIGHT_STATUS_URL = "https://test.api.amadeus.com/v2/schedule/flights"
-CHECKIN_LINKS_URL = "https://test.api.amadeus.com/v2/reference-data/urls/checkin-links"
-AIRLINE_LOOKUP_URL = "https://test.api.amadeus.com/v1/reference-data/airlines"
+async def _http(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    One upstream HTTP call on the pooled client, timed and logged.
+    """
+    started = time.perf_counter()
+    try:
+        res = await get_http_client().request(method, url, timeout=request_timeout(), **kwargs)
+    except httpx.HTTPError as e:
+        log_upstream(method, url, started, error=e)
+        raise
+    log_upstream(method, url, started, res.status_code, len(res.content), res.text if res.is_error else None)
+    return res
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 # -------------------------------------------------
 # OAuth
 # -------------------------------------------------
-async def get_access_token() -> str:
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.post(
+# Refresh this long before the token actually expires
+TOKEN_EXPIRY_MARGIN = 60
+
+_token_cache = TTLCache(ttl=0, max_entries=1)
+_token_lock = asyncio.Lock()
+
+
+async def _fetch_access_token() -> dict:
+    async with scheduler.slot():
+        res = await _http(
+            "POST",
             TOKEN_URL,
             data={
                 "grant_type": "client_credentials",
@@ -45,16 +135,238 @@ async def get_access_token() -> str:
             },
             headers={"Content-Type": "application/x-www-form-urlencoded"},
         )
+    res.raise_for_status()
+    data = res.json()
+    return {
+        "access_token": data["access_token"],
+        "expires_at": time.time() + data.get("expires_in", 1799) - TOKEN_EXPIRY_MARGIN,
+    }
+
+
+# Tokens are only valid for the API and client they were issued for
+# (a stand-in's token must never reach the real API)
+SHARED_TOKEN_KEY = f"oauth-token:{BASE_URL}:{CLIENT_ID}"
+
+
+async def _shared_access_token() -> dict:
+    """
+    Read the token other workers stored, or fetch and store one while
+    holding a file lock so only one worker refreshes at a time.
+    """
+    token = await asyncio.to_thread(_shared_state.get, SHARED_TOKEN_KEY)
+    if token:
+        return token
+
+    lock = await asyncio.to_thread(file_lock, f"{SHARED_STATE_DB}.token.lock")
+    try:
+        token = await asyncio.to_thread(_shared_state.get, SHARED_TOKEN_KEY)
+        if not token:
+            token = await _fetch_access_token()
+            await asyncio.to_thread(
+                _shared_state.set, SHARED_TOKEN_KEY, token, token["expires_at"] - time.time()
+            )
+    finally:
+        lock.close()
+    return token
+
+
+async def get_access_token() -> str:
+    token = _token_cache.get("token")
+    if token:
+        return token
+
+    async with _token_lock:
+        token = _token_cache.get("token")
+        if token:
+            return token
+
+        entry = await (_shared_access_token() if _shared_state else _fetch_access_token())
+        _token_cache.set("token", entry["access_token"], ttl=entry["expires_at"] - time.time())
+        return entry["access_token"]
+
+
+async def _drop_access_token(token: str) -> None:
+    """
+    Forget a token Amadeus rejected (revoked, or expired early), here
+    and in the shared store, unless it was already replaced.
+    """
+    async with _token_lock:
+        if _token_cache.get("token") == token:
+            _token_cache.pop("token")
+        if _shared_state:
+            shared = await asyncio.to_thread(_shared_state.get, SHARED_TOKEN_KEY)
+            if shared and shared.get("access_token") == token:
+                await asyncio.to_thread(_shared_state.delete, SHARED_TOKEN_KEY)
+
+# -------------------------------------------------
+# Request layer
+# -------------------------------------------------
+def _error_body(res: httpx.Response) -> dict:
+    try:
+        return res.json()
+    except ValueError:
+        return {"errors": [{"status": res.status_code, "detail": res.text[:500]}]}
+
+
+async def _send(
+    method: str,
+    url: str,
+    params: Optional[dict],
+    json: Optional[dict],
+    priority: Optional[int]
+) -> httpx.Response:
+    token = await get_access_token()
+    async with scheduler.slot(priority):
+        res = await _http(method, url, headers={"Authorization": f"Bearer {token}"}, params=params, json=json)
+
+    if res.status_code == 401:
+        # Retry once with a new token
+        await _drop_access_token(token)
+        token = await get_access_token()
+        async with scheduler.slot(priority):
+            res = await _http(method, url, headers={"Authorization": f"Bearer {token}"}, params=params, json=json)
+    return res
+
+
+async def _cache_get(key: str) -> Optional[dict]:
+    entry = _reference_cache.get(key)
+    if entry is None and _shared_state:
+        entry = await asyncio.to_thread(_shared_state.get, key)
+        if isinstance(entry, dict) and "fetched_at" in entry:
+            _reference_cache.set(key, entry)
+    return entry if isinstance(entry, dict) and "fetched_at" in entry else None
+
+
+async def _cache_set(key: str, data, ttl: float) -> None:
+    entry = {"fetched_at": time.time(), "data": data}
+    _reference_cache.set(key, entry, ttl=ttl)
+    if _shared_state:
+        await asyncio.to_thread(_shared_state.set, key, entry, ttl)
+
+
+# Cache keys with a background refresh in flight
+_revalidating: dict[str, asyncio.Task] = {}
+
+
+def _revalidate(
+    key: str, method: str, url: str, params, json, ttl: float,
+    on_fetch: Optional[Callable[[dict], None]] = None
+) -> None:
+    """
+    Refresh a stale cache entry in the background, once per key.
+    """
+    if key in _revalidating:
+        return
+
+    async def refresh():
+        res = await _send(method, url, params, json, PRIORITY_BACKGROUND)
+        if res.is_success:
+            data = res.json()
+            await _cache_set(key, data, ttl)
+            if on_fetch:
+                on_fetch(data)
+
+    def done(task: asyncio.Task):
+        _revalidating.pop(key, None)
+        if not task.cancelled():
+            # Failed refreshes leave the stale entry in place
+            task.exception()
+
+    # Not bound to the caller's deadline or priority
+    with deadline_scope(REQUEST_TIMEOUT, reset=True):
+        task = asyncio.create_task(refresh())
+    task.add_done_callback(done)
+    _revalidating[key] = task
+
+
+def _with_age(data, age: float, stale: bool):
+    if not isinstance(data, dict):
+        return data
+    return {**data, "meta": {**data.get("meta", {}), "cache": {"age_seconds": round(age), "stale": stale}}}
+
+
+async def amadeus_request(
+    method: str,
+    url: str,
+    *,
+    params: Optional[dict] = None,
+    json: Optional[dict] = None,
+    priority: Optional[int] = None,
+    raise_for_status: bool = True,
+    cache_ttl: Optional[float] = None,
+    stale_grace: float = 0,
+    negative_cache: Optional[bool] = None,
+    on_fetch: Optional[Callable[[dict], None]] = None
+) -> dict:
+    """
+    Send one authenticated request through the shared scheduler.
+    priority defaults to the caller's request_priority(); the timeout
+    is capped by the caller's deadline_scope().
+    With cache_ttl, successful responses are cached in process and,
+    when configured, in the shared store. With stale_grace, an entry
+    up to stale_grace seconds past cache_ttl is still returned at once
+    while one background request refreshes it; such responses carry
+    meta.cache = {"age_seconds", "stale"}.
+    negative_cache (default: GET requests only) remembers empty results
+    and NEGATIVE_CACHE_STATUSES errors for NEGATIVE_CACHE_TTL seconds.
+    on_fetch is called with every successful response that came from
+    upstream, including background refreshes, but not with cached ones.
+    """
+    request_key = f"{method} {url} {sorted((params or {}).items())}"
+    if json is not None:
+        request_key += f" {json!r}"
+
+    if negative_cache is None:
+        negative_cache = method == "GET"
+    if negative_cache:
+        known = _negative_cache.get(request_key)
+        if known is not None:
+            res, data = known
+            if raise_for_status:
+                res.raise_for_status()
+            return data
+
+    if cache_ttl:
+        entry = await _cache_get(request_key)
+        if entry is not None:
+            age = time.time() - entry["fetched_at"]
+            if age <= cache_ttl:
+                return _with_age(entry["data"], age, False) if stale_grace else entry["data"]
+            if age <= cache_ttl + stale_grace:
+                _revalidate(request_key, method, url, params, json, cache_ttl + stale_grace, on_fetch)
+                return _with_age(entry["data"], age, True)
+
+    res = await _send(method, url, params, json, priority)
+
+    if negative_cache and res.status_code in NEGATIVE_CACHE_STATUSES:
+        _negative_cache.set(request_key, (res, _error_body(res)))
+
+    if raise_for_status:
         res.raise_for_status()
-        return res.json()["access_token"]
+    data = res.json()
+
+    if negative_cache and res.is_success and isinstance(data, dict) and data.get("data") == []:
+        _negative_cache.set(request_key, (res, data))
+
+    if cache_ttl and res.is_success:
+        await _cache_set(request_key, data, cache_ttl + stale_grace)
+    if on_fetch and res.is_success:
+        on_fetch(data)
+    return data
 
 # -------------------------------------------------
 # Multi-city Search
 # -------------------------------------------------
-async def search_multicity_india() -> dict:
-    token = await get_access_token()
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+# Offers stay bookable for a while; a short cache lets the same search
+# be re-displayed (e.g. in another currency) without a new query
+OFFER_SEARCH_CACHE_TTL = 5 * 60
+
 
+# Upper limit of the flight offers search
+MAX_FLIGHT_OFFERS = 250
+
+
+async def search_multicity_india(max_offers: int = 5) -> dict:
     body = {
         "currencyCode": "INR",
         "originDestinations": [
@@ -65,29 +377,23 @@ async def search_multicity_india() -> dict:
         ],
         "travelers": [{"id": "1", "travelerType": "ADULT"}],
         "sources": ["GDS"],
-        "searchCriteria": {"maxFlightOffers": 5},
+        "searchCriteria": {"maxFlightOffers": max(1, min(max_offers, MAX_FLIGHT_OFFERS))},
     }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.post(FLIGHT_OFFERS_URL, headers=headers, json=body)
-        res.raise_for_status()
-        return res.json()
+    return await amadeus_request("POST", FLIGHT_OFFERS_URL, json=body, cache_ttl=OFFER_SEARCH_CACHE_TTL)
 
 # -------------------------------------------------
 # Pricing
 # -------------------------------------------------
-async def price_flight_offer(flight_offer: dict) -> dict:
-    token = await get_access_token()
+# The pricing endpoint accepts at most this many offers per request
+PRICING_BATCH_SIZE = 6
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
 
+async def _post_pricing(flight_offers: List[dict]) -> dict:
     body = {
         "data": {
             "type": "flight-offers-pricing",
-            "flightOffers": [flight_offer],
+            "flightOffers": flight_offers,
             "pricingOptions": {
                 "fareType": ["PUBLISHED"],
                 "includedCheckedBagsOnly": True
@@ -96,50 +402,102 @@ async def price_flight_offer(flight_offer: dict) -> dict:
         }
     }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.post(
-            FLIGHT_PRICING_URL,
-            headers=headers,
-            json=body
-        )
+    # Error bodies are logged by the request layer
+    return await amadeus_request("POST", FLIGHT_PRICING_URL, json=body)
 
-        # IMPORTANT: print error details if pricing fails
-        if res.status_code != 200:
-            print(" Pricing error response:")
-            print(res.text)
 
-        res.raise_for_status()
-        return res.json()
+async def price_flight_offer(flight_offer: dict) -> dict:
+    return await _post_pricing([flight_offer])
+
+
+async def price_flight_offers(flight_offers: List[dict]) -> list:
+    """
+    Price several offers with as few upstream calls as possible.
+    Offers are sent PRICING_BATCH_SIZE at a time, chunks concurrently.
+    Returns one entry per input offer, in input order: either
+    {"id", "priced"} or {"id", "error"}.
+    """
+    chunks = [
+        flight_offers[i:i + PRICING_BATCH_SIZE]
+        for i in range(0, len(flight_offers), PRICING_BATCH_SIZE)
+    ]
+
+    async def price_chunk(chunk: List[dict]) -> list:
+        # Offers from different searches can share an ID (they restart
+        # at "1"), so each chunk is renumbered and matched by position
+        renumbered = [{**offer, "id": str(position)} for position, offer in enumerate(chunk, start=1)]
+        try:
+            response = await _post_pricing(renumbered)
+        except (httpx.HTTPError, SchedulerOverloaded) as e:
+            return [{"id": offer.get("id"), "error": str(e)} for offer in chunk]
+
+        priced = {
+            offer.get("id"): offer
+            for offer in response.get("data", {}).get("flightOffers", [])
+        }
+        results = []
+        for position, offer in enumerate(chunk, start=1):
+            match = priced.get(str(position))
+            if match is None:
+                results.append({"id": offer.get("id"), "error": "Offer missing from pricing response"})
+            else:
+                results.append({"id": offer.get("id"), "priced": {**match, "id": offer.get("id")}})
+        return results
+
+    def timed_out(index: int) -> list:
+        return [{"id": offer.get("id"), "error": "Deadline exceeded"} for offer in chunks[index]]
+
+    results = []
+    for chunk_results in await gather_within_deadline((price_chunk(chunk) for chunk in chunks), timed_out):
+        results.extend(chunk_results)
+    return results
 
 
 # -------------------------------------------------
 # Seatmaps
 # -------------------------------------------------
-async def get_seatmap_from_flight_offer(flight_offer: dict) -> dict:
-    token = await get_access_token()
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+SEATMAP_CACHE_TTL = 120
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.post(SEATMAP_URL, headers=headers, json={"data": [flight_offer]})
-        res.raise_for_status()
-        return res.json()
+_seatmap_cache = TTLCache(ttl=SEATMAP_CACHE_TTL)
 
-async def get_seatmap_from_order(order_id: str) -> dict:
-    token = await get_access_token()
-    headers = {"Authorization": f"Bearer {token}"}
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.get(f"{SEATMAP_URL}?flightOrderId={order_id}", headers=headers)
-        res.raise_for_status()
-        return res.json()
+def _segments_key(flight_offer: dict) -> tuple:
+    return tuple(
+        (seg.get("carrierCode"), seg.get("number"),
+         seg.get("departure", {}).get("iataCode"), seg.get("departure", {}).get("at"))
+        for itin in flight_offer.get("itineraries", [])
+        for seg in itin.get("segments", [])
+    )
+
+
+async def get_seatmap_from_flight_offer(flight_offer: dict, use_cache: bool = True) -> dict:
+    key = ("offer", _segments_key(flight_offer))
+    if use_cache:
+        cached = _seatmap_cache.get(key)
+        if cached is not None:
+            return cached
+
+    data = await amadeus_request("POST", SEATMAP_URL, json={"data": [flight_offer]})
+
+    _seatmap_cache.set(key, data)
+    return data
+
+async def get_seatmap_from_order(order_id: str, use_cache: bool = True) -> dict:
+    key = ("order", order_id)
+    if use_cache:
+        cached = _seatmap_cache.get(key)
+        if cached is not None:
+            return cached
+
+    data = await amadeus_request("GET", SEATMAP_URL, params={"flightOrderId": order_id})
+
+    _seatmap_cache.set(key, data)
+    return data
 
 # -------------------------------------------------
 # Flight Orders
 # -------------------------------------------------
 async def create_flight_order(priced_flight_offer: dict) -> dict:
-    token = await get_access_token()
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-
     body = {
         "data": {
             "type": "flight-order",
@@ -157,197 +515,241 @@ async def create_flight_order(priced_flight_offer: dict) -> dict:
         }
     }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.post(FLIGHT_ORDER_URL, headers=headers, json=body)
-        res.raise_for_status()
-        return res.json()
+    return await amadeus_request("POST", FLIGHT_ORDER_URL, json=body)
 
 async def retrieve_flight_order(order_id: str) -> dict:
-    token = await get_access_token()
-    headers = {"Authorization": f"Bearer {token}"}
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.get(f"{FLIGHT_ORDER_URL}/{order_id}", headers=headers)
-        res.raise_for_status()
-        return res.json()
+    return await amadeus_request("GET", f"{FLIGHT_ORDER_URL}/{order_id}")
 
 async def cancel_flight_order(order_id: str) -> dict:
-    token = await get_access_token()
-    headers = {"Authorization": f"Bearer {token}"}
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.delete(f"{FLIGHT_ORDER_URL}/{order_id}", headers=headers)
-        res.raise_for_status()
-        return res.json()
+    return await amadeus_request("DELETE", f"{FLIGHT_ORDER_URL}/{order_id}")
 
 # -------------------------------------------------
 # Inspiration / Cheapest Dates / Availability
 # -------------------------------------------------
+# Inspiration and cheapest-date results are themselves pre-computed
+# by Amadeus: serve them from cache for PRICE_SEARCH_CACHE_TTL, then
+# for up to PRICE_SEARCH_STALE_GRACE more while refreshing in the background
+PRICE_SEARCH_CACHE_TTL = 10 * 60
+PRICE_SEARCH_STALE_GRACE = 30 * 60
+
+
 async def get_flight_inspiration(
     origin: str,
     max_price: int,
-    currency: str | None = None
+    currency: str | None = None,
+    departure_date: str | None = None,
+    on_fetch: Optional[Callable[[dict], None]] = None
 ):
-    token = await get_access_token()
-
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-
-    params = {
-        "origin": origin,
-        "maxPrice": max_price
-    }
-
-    # Add currency ONLY if it's a real value
-    if currency is not None and currency != "":
+    """
+    on_fetch is called with every response fetched upstream (not with
+    cached ones), converted to currency but not filtered by max_price.
+    """
+    params = {"origin": origin}
+    if departure_date:
+        params["departureDate"] = departure_date
+
+    # Query once in the origin's own currency and convert locally, so
+    # other currencies are served from the same cached response. Only
+    # currencies missing from the rate table are sent upstream.
+    local = not currency or rates.supports(currency)
+    if not local:
         params["currency"] = currency
+        params["maxPrice"] = max_price
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.get(
-            "https://test.api.amadeus.com/v1/shopping/flight-destinations",
-            headers=headers,
-            params=params
+    try:
+        response = await amadeus_request(
+            "GET", FLIGHT_INSPIRATION_URL, params=params,
+            cache_ttl=PRICE_SEARCH_CACHE_TTL, stale_grace=PRICE_SEARCH_STALE_GRACE,
+            on_fetch=_converting(on_fetch, currency if local else None)
         )
-
+    except httpx.HTTPStatusError as e:
         # Sandbox can randomly fail
-        if res.status_code >= 500:
+        if e.response.status_code >= 500:
             return {
                 "data": [],
                 "warning": "Sandbox internal error (500)"
             }
+        raise
+
+    if not local:
+        return response
+
+    # maxPrice is applied here, in the requested currency
+    response = convert_response(response, currency)
+    return {
+        **response,
+        "data": [
+            item for item in response.get("data", [])
+            if _within_price(item.get("price", {}).get("total"), max_price)
+        ],
+    }
+
+
+def _converting(on_fetch: Optional[Callable[[dict], None]], currency: str | None):
+    if on_fetch is None or not currency:
+        return on_fetch
+    return lambda data: on_fetch(convert_response(data, currency))
 
-        res.raise_for_status()
-        return res.json()
+
+def _within_price(total, max_price) -> bool:
+    try:
+        return float(total) <= max_price
+    except (TypeError, ValueError):
+        return True
 
 
 
 async def get_cheapest_flight_dates(
     origin: str,
     destination: str,
-    currency: str = "INR"
+    currency: str = "INR",
+    on_fetch: Optional[Callable[[dict], None]] = None
 ) -> dict:
-    token = await get_access_token()
-
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-
+    """
+    on_fetch is called with every response fetched upstream (not with
+    cached ones), converted to currency.
+    """
     params = {
         "origin": origin,
         "destination": destination
     }
 
-    # Add currency only if provided
-    if currency:
+    # Same as inspiration: convert locally when the rate is known
+    local = not currency or rates.supports(currency)
+    if not local:
         params["currency"] = currency
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.get(
-            CHEAPEST_DATE_URL,
-            headers=headers,
-            params=params
+    try:
+        response = await amadeus_request(
+            "GET", CHEAPEST_DATE_URL, params=params,
+            cache_ttl=PRICE_SEARCH_CACHE_TTL, stale_grace=PRICE_SEARCH_STALE_GRACE,
+            on_fetch=_converting(on_fetch, currency if local else None)
         )
-
-        #  HANDLE SANDBOX SERVER ERRORS FIRST
-        if res.status_code >= 500:
+    except httpx.HTTPStatusError as e:
+        #  HANDLE SANDBOX SERVER ERRORS
+        if e.response.status_code >= 500:
             return {
                 "data": [],
                 "warning": "Sandbox internal error (500)"
             }
+        raise
 
-        res.raise_for_status()
-        return res.json()
+    return convert_response(response, currency) if local else response
 
 
 
-async def get_flight_availability(origin: str, destination: str, departure_date: str) -> dict:
-    token = await get_access_token()
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+# The availability endpoint accepts at most this many originDestinations
+AVAILABILITY_BATCH_SIZE = 6
+
 
+def _availability_body(legs: List[tuple], airline: Optional[str] = None) -> dict:
     body = {
-        "originDestinations": [{
-            "id": "1",
-            "originLocationCode": origin,
-            "destinationLocationCode": destination,
-            "departureDateTime": {"date": departure_date},
-        }],
+        "originDestinations": [
+            {
+                "id": str(index),
+                "originLocationCode": origin,
+                "destinationLocationCode": destination,
+                "departureDateTime": {"date": departure_date},
+            }
+            for index, (origin, destination, departure_date) in enumerate(legs, start=1)
+        ],
         "travelers": [{"id": "1", "travelerType": "ADULT"}],
         "sources": ["GDS"],
     }
+    if airline:
+        body["searchCriteria"] = {
+            "flightFilters": {"carrierRestrictions": {"includedCarrierCodes": [airline]}}
+        }
+    return body
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.post(AVAILABILITY_URL, headers=headers, json=body)
-        res.raise_for_status()
-        return res.json()
+
+async def get_flight_availability(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    airline: Optional[str] = None
+) -> dict:
+    body = _availability_body([(origin, destination, departure_date)], airline)
+    return await amadeus_request("POST", AVAILABILITY_URL, json=body, negative_cache=True)
+
+
+async def get_flight_availabilities(legs: List[tuple], airline: Optional[str] = None) -> list:
+    """
+    Availability for many (origin, destination, date) legs with as few
+    upstream calls as possible: AVAILABILITY_BATCH_SIZE legs per request,
+    chunks concurrently. Returns one entry per leg, in input order:
+    {"leg", "data"} or {"leg", "error"}.
+    """
+    chunks = [
+        legs[i:i + AVAILABILITY_BATCH_SIZE]
+        for i in range(0, len(legs), AVAILABILITY_BATCH_SIZE)
+    ]
+
+    async def fetch_chunk(chunk: List[tuple]) -> list:
+        try:
+            response = await amadeus_request(
+                "POST", AVAILABILITY_URL, json=_availability_body(chunk, airline), negative_cache=True
+            )
+        except (httpx.HTTPError, SchedulerOverloaded) as e:
+            return [{"leg": leg, "error": str(e)} for leg in chunk]
+
+        by_leg: dict[str, list] = {}
+        for item in response.get("data", []):
+            by_leg.setdefault(item.get("originDestinationId"), []).append(item)
+        return [{"leg": leg, "data": by_leg.get(str(index), [])} for index, leg in enumerate(chunk, start=1)]
+
+    def timed_out(index: int) -> list:
+        return [{"leg": leg, "error": "Deadline exceeded"} for leg in chunks[index]]
+
+    results = []
+    for chunk_results in await gather_within_deadline((fetch_chunk(chunk) for chunk in chunks), timed_out):
+        results.extend(chunk_results)
+    return results
 
 # -------------------------------------------------
 # Flight Status
 # -------------------------------------------------
 async def get_flight_status(carrier_code: str, flight_number: str, departure_date: str) -> dict:
-    token = await get_access_token()
-    headers = {"Authorization": f"Bearer {token}"}
     params = {
         "carrierCode": carrier_code,
         "flightNumber": flight_number,
         "scheduledDepartureDate": departure_date,
     }
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.get(FLIGHT_STATUS_URL, headers=headers, params=params)
-        res.raise_for_status()
-        return res.json()
+    return await amadeus_request("GET", FLIGHT_STATUS_URL, params=params)
 
 # -------------------------------------------------
 # Check-in Links
 # -------------------------------------------------
 async def get_flight_checkin_links(airline_code: str, language: str = "EN") -> dict:
-    token = await get_access_token()
-    headers = {"Authorization": f"Bearer {token}"}
     params = {"airlineCode": airline_code, "language": language}
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.get(CHECKIN_LINKS_URL, headers=headers, params=params)
-        res.raise_for_status()
-        return res.json()
+    return await amadeus_request("GET", CHECKIN_LINKS_URL, params=params, cache_ttl=REFERENCE_CACHE_TTL)
 
 # -------------------------------------------------
 # Airline Code Lookup
 # -------------------------------------------------
 async def get_airline_name(airline_codes: List[str]) -> dict:
-    token = await get_access_token()
-    headers = {"Authorization": f"Bearer {token}"}
     params = {"airlineCodes": ",".join(airline_codes)}
-    async with httpx.AsyncClient(timeout=30) as client:
-        res = await client.get(AIRLINE_LOOKUP_URL, headers=headers, params=params)
-        res.raise_for_status()
-        return res.json()
+    return await amadeus_request("GET", AIRLINE_LOOKUP_URL, params=params, cache_ttl=REFERENCE_CACHE_TTL)
 
 # -------------------------------------------------
 # Airline Routes (Destinations served by airline)
 # -------------------------------------------------
-AIRLINE_ROUTES_URL = "https://test.api.amadeus.com/v1/airline/destinations"
+AIRLINE_ROUTES_URL = f"{BASE_URL}/v1/airline/destinations"
 
 async def get_airline_routes(airline_code: str) -> dict:
     """
     Returns all destinations served by a given airline.
     Example: airline_code = 'EK'
     """
-    token = await get_access_token()
-    headers = {"Authorization": f"Bearer {token}"}
     params = {"airlineCode": airline_code}
-
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.get(
-            AIRLINE_ROUTES_URL,
-            headers=headers,
-            params=params,
-        )
-        response.raise_for_status()
-        return response.json()
+    return await amadeus_request("GET", AIRLINE_ROUTES_URL, params=params, cache_ttl=REFERENCE_CACHE_TTL)
 
 
 # ---------------------------------------------------------
 # Tours & Activities (Amadeus Discover)
 # ---------------------------------------------------------
 
-ACTIVITIES_URL = "https://test.api.amadeus.com/v1/shopping/activities"
+ACTIVITIES_URL = f"{BASE_URL}/v1/shopping/activities"
 
 
 async def search_activities(
@@ -358,26 +760,13 @@ async def search_activities(
     """
     Search tours & activities around a point
     """
-    token = await get_access_token()
-
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-
     params = {
         "latitude": latitude,
         "longitude": longitude,
         "radius": radius
     }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.get(
-            ACTIVITIES_URL,
-            headers=headers,
-            params=params
-        )
-        response.raise_for_status()
-        return response.json()
+    return await amadeus_request("GET", ACTIVITIES_URL, params=params)
 
 
 async def search_activities_by_square(
@@ -389,12 +778,6 @@ async def search_activities_by_square(
     """
     Search tours & activities inside a square area
     """
-    token = await get_access_token()
-
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-
     params = {
         "north": north,
         "south": south,
@@ -402,61 +785,76 @@ async def search_activities_by_square(
         "west": west
     }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.get(
-            f"{ACTIVITIES_URL}/by-square",
-            headers=headers,
-            params=params
-        )
-        response.raise_for_status()
-        return response.json()
+    return await amadeus_request("GET", f"{ACTIVITIES_URL}/by-square", params=params)
 
 
 async def get_activity_by_id(activity_id: str):
     """
     Retrieve one activity by ID
     """
-    token = await get_access_token()
+    return await amadeus_request("GET", f"{ACTIVITIES_URL}/{activity_id}")
 
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.get(
-            f"{ACTIVITIES_URL}/{activity_id}",
-            headers=headers
-        )
-        response.raise_for_status()
-        return response.json()
+ACTIVITY_CACHE_TTL = 6 * 60 * 60
+ACTIVITY_FETCH_CONCURRENCY = 5
+
+_activity_cache = TTLCache(ttl=ACTIVITY_CACHE_TTL)
+
+
+async def get_activities_by_ids(
+    activity_ids: List[str],
+    max_concurrency: int = ACTIVITY_FETCH_CONCURRENCY
+) -> list:
+    """
+    Retrieve several activities by ID.
+    Cached IDs are served locally, the rest are fetched concurrently.
+    Returns one entry per input ID, in input order.
+    """
+    results = {}
+    missing = []
+
+    for activity_id in dict.fromkeys(activity_ids):
+        cached = _activity_cache.get(activity_id)
+        if cached is not None:
+            results[activity_id] = {"id": activity_id, "data": cached, "cached": True}
+        else:
+            missing.append(activity_id)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(activity_id: str) -> dict:
+        async with semaphore:
+            try:
+                response = await get_activity_by_id(activity_id)
+            except (httpx.HTTPError, SchedulerOverloaded) as e:
+                return {"id": activity_id, "error": str(e)}
+
+        data = response.get("data")
+        _activity_cache.set(activity_id, data)
+        return {"id": activity_id, "data": data, "cached": False}
+
+    def timed_out(index: int) -> dict:
+        return {"id": missing[index], "error": "Deadline exceeded"}
+
+    for result in await gather_within_deadline((fetch(i) for i in missing), timed_out):
+        results[result["id"]] = result
+
+    return [results[activity_id] for activity_id in activity_ids]
 
 # ---------------------------------------------------------
 # City Search
 # ---------------------------------------------------------
 
-CITY_SEARCH_URL = "https://test.api.amadeus.com/v1/reference-data/locations/cities"
+CITY_SEARCH_URL = f"{BASE_URL}/v1/reference-data/locations/cities"
 
 
 async def search_cities(keyword: str, max_results: int = 10):
     """
     Search cities by keyword (autocomplete)
     """
-    token = await get_access_token()
-
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-
     params = {
         "keyword": keyword,
         "max": max_results
     }
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        response = await client.get(
-            CITY_SEARCH_URL,
-            headers=headers,
-            params=params
-        )
-        response.raise_for_status()
-        return response.json()
+    return await amadeus_request("GET", CITY_SEARCH_URL, params=params, cache_ttl=REFERENCE_CACHE_TTL)
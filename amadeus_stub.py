@@ -0,0 +1,95 @@
+"""
+Local stand-in for the Amadeus API, for load tests and trace replays.
+
+    python amadeus_stub.py --port 9000 --latency-ms 150
+    AMADEUS_BASE_URL=http://127.0.0.1:9000 python flights_server.py
+
+Hands out tokens, echoes offers sent for pricing, keeps flight orders
+in memory and answers every other endpoint with an empty, well-formed
+result, all after a fixed latency, so the servers' own queueing,
+caching and fan-out costs can be measured without the rate-limited
+test environment.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+def create_stub_app(latency_ms: float = 100.0, jitter_ms: float = 0.0) -> Starlette:
+    async def delay():
+        await asyncio.sleep(max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000)
+
+    async def token(request: Request):
+        await delay()
+        return JSONResponse({"access_token": "stub-token", "token_type": "Bearer", "expires_in": 1799})
+
+    async def pricing(request: Request):
+        body = await request.json()
+        await delay()
+        return JSONResponse({
+            "data": {
+                "type": "flight-offers-pricing",
+                "flightOffers": body.get("data", {}).get("flightOffers", []),
+            }
+        })
+
+    orders: dict[str, dict] = {}
+    order_numbers = itertools.count(1)
+
+    async def create_order(request: Request):
+        body = await request.json()
+        await delay()
+        number = next(order_numbers)
+        order = {
+            **body.get("data", {}),
+            "type": "flight-order",
+            "id": f"STUB{number:06d}",
+            "associatedRecords": [{"reference": f"STB{number:03d}", "originSystemCode": "GDS"}],
+        }
+        orders[order["id"]] = order
+        return JSONResponse({"data": order}, status_code=201)
+
+    async def order(request: Request):
+        await delay()
+        order_id = request.path_params["order_id"]
+        found = orders.get(order_id) if request.method == "GET" else orders.pop(order_id, None)
+        if found is None:
+            return JSONResponse(
+                {"errors": [{"status": 404, "code": 1797, "title": "NOT FOUND", "detail": "order not found"}]},
+                status_code=404,
+            )
+        return JSONResponse({"data": found})
+
+    async def anything(request: Request):
+        await delay()
+        return JSONResponse({"meta": {"count": 0}, "data": []})
+
+    return Starlette(routes=[
+        Route("/v1/security/oauth2/token", token, methods=["POST"]),
+        Route("/v1/shopping/flight-offers/pricing", pricing, methods=["POST"]),
+        Route("/v1/booking/flight-orders", create_order, methods=["POST"]),
+        Route("/v1/booking/flight-orders/{order_id}", order, methods=["GET", "DELETE"]),
+        Route("/{path:path}", anything, methods=["GET", "POST", "DELETE"]),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local Amadeus API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    uvicorn.run(create_stub_app(args.latency_ms, args.jitter_ms), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
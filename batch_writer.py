@@ -0,0 +1,51 @@
+import asyncio
+import atexit
+from typing import Callable, Optional
+
+
+class BatchWriter:
+    """
+    Buffers items in memory and hands them to write_batch in batches
+    on a worker thread: flush_interval seconds after the first pending
+    item, or as soon as batch_size items are waiting. Whatever is still
+    pending is written at exit.
+    """
+
+    def __init__(self, write_batch: Callable[[list], None], flush_interval: float, batch_size: int):
+        self._write_batch = write_batch
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending: list = []
+        self._flush_task: Optional[asyncio.Task] = None
+        atexit.register(self._write_pending)
+
+    def add(self, item) -> None:
+        self.extend((item,))
+
+    def extend(self, items) -> None:
+        self._pending.extend(items)
+        if len(self._pending) >= self.batch_size:
+            self._schedule_flush(0)
+        elif self._pending:
+            self._schedule_flush(self.flush_interval)
+
+    def _schedule_flush(self, delay: float) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            if delay:
+                return
+            self._flush_task.cancel()
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        if self._pending:
+            await asyncio.to_thread(self._write_pending)
+
+    def _write_pending(self) -> None:
+        batch, self._pending = self._pending, []
+        if batch:
+            self._write_batch(batch)
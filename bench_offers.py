@@ -0,0 +1,149 @@
+"""
+Compare nested-dict flight offers with the compact FlightOffer model.
+
+    python bench_offers.py --offers 250 --rounds 200
+
+Reports retained memory per offer and the time to summarize
+(price + carrier set), and to convert back to upstream JSON.
+"""
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from offer_model import FlightOffer
+
+AIRPORTS = ["DEL", "BOM", "BLR", "MAA", "HYD", "CCU", "AMD", "GOI", "COK", "PNQ"]
+CARRIERS = ["AI", "6E", "UK", "SG", "QP"]
+
+
+def make_offer(offer_id: int, legs: int = 4) -> dict:
+    """
+    Synthetic offer shaped like a flight-offers search result.
+    """
+    itineraries = []
+    for leg in range(legs):
+        segments = []
+        for stop in range(random.choice((1, 1, 2))):
+            carrier = random.choice(CARRIERS)
+            origin, destination = random.sample(AIRPORTS, 2)
+            day = 3 + leg * 2
+            hour = random.randint(5, 20)
+            segments.append({
+                "departure": {"iataCode": origin, "terminal": "3", "at": f"2026-10-{day:02d}T{hour:02d}:00:00"},
+                "arrival": {"iataCode": destination, "terminal": "1", "at": f"2026-10-{day:02d}T{hour + 2:02d}:10:00"},
+                "carrierCode": carrier,
+                "number": str(random.randint(100, 999)),
+                "aircraft": {"code": "32N"},
+                "operating": {"carrierCode": carrier},
+                "duration": "PT2H10M",
+                "id": str(leg * 2 + stop + 1),
+                "numberOfStops": 0,
+                "blacklistedInEU": False,
+            })
+        itineraries.append({"duration": f"PT{2 * len(segments)}H{random.randint(0, 59)}M", "segments": segments})
+
+    total = f"{random.randint(12000, 40000)}.00"
+    return {
+        "type": "flight-offer",
+        "id": str(offer_id),
+        "source": "GDS",
+        "instantTicketingRequired": False,
+        "nonHomogeneous": False,
+        "oneWay": False,
+        "lastTicketingDate": "2026-10-01",
+        "numberOfBookableSeats": 9,
+        "itineraries": itineraries,
+        "price": {
+            "currency": "INR",
+            "total": total,
+            "base": total,
+            "fees": [{"amount": "0.00", "type": "SUPPLIER"}, {"amount": "0.00", "type": "TICKETING"}],
+            "grandTotal": total,
+        },
+        "pricingOptions": {"fareType": ["PUBLISHED"], "includedCheckedBagsOnly": True},
+        "validatingAirlineCodes": [itineraries[0]["segments"][0]["carrierCode"]],
+        "travelerPricings": [{
+            "travelerId": "1",
+            "fareOption": "STANDARD",
+            "travelerType": "ADULT",
+            "price": {"currency": "INR", "total": total, "base": total},
+            "fareDetailsBySegment": [
+                {
+                    "segmentId": seg["id"],
+                    "cabin": "ECONOMY",
+                    "fareBasis": "TL1YXSII",
+                    "class": "T",
+                    "includedCheckedBags": {"weight": 15, "weightUnit": "KG"},
+                }
+                for itin in itineraries for seg in itin["segments"]
+            ],
+        }],
+    }
+
+
+def retained(build) -> tuple[int, object]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return size, result
+
+
+def timed(fn, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return 1000 * (time.perf_counter() - started) / rounds
+
+
+def dict_summary(offers: list[dict]) -> list:
+    return [
+        (
+            offer["price"]["grandTotal"],
+            {seg["carrierCode"] for itin in offer["itineraries"] for seg in itin["segments"]},
+        )
+        for offer in offers
+    ]
+
+
+def model_summary(models: list[FlightOffer]) -> list:
+    return [(model.grand_total, model.carriers) for model in models]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark flight offer representations")
+    parser.add_argument("--offers", type=int, default=250)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(7)
+    payload = json.dumps({"data": [make_offer(i + 1) for i in range(args.offers)]})
+
+    dict_bytes, offers = retained(lambda: json.loads(payload)["data"])
+    model_bytes, models = retained(lambda: [FlightOffer(offer) for offer in json.loads(payload)["data"]])
+
+    results = {
+        "offers": args.offers,
+        "bytes_per_offer": {
+            "dict": dict_bytes // args.offers,
+            "model": model_bytes // args.offers,
+        },
+        "summary_ms": {
+            "dict": round(timed(lambda: dict_summary(offers), args.rounds), 3),
+            "model": round(timed(lambda: model_summary(models), args.rounds), 3),
+        },
+        "build_models_ms": round(timed(lambda: [FlightOffer(offer) for offer in offers], max(args.rounds // 10, 1)), 3),
+        "to_json_ms_per_offer": round(timed(lambda: models[0].to_json(), args.rounds), 4),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
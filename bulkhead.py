@@ -0,0 +1,166 @@
+import asyncio
+import functools
+import inspect
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from deadline import DeadlineExceeded, deadline_scope, remaining, tool_budget
+
+from scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_BOOKING,
+    PRIORITY_INTERACTIVE,
+    request_priority,
+)
+
+# -------------------------------------------------
+# Tool groups: (max concurrent calls, max queued calls)
+# Override with BULKHEAD_<GROUP>_CONCURRENCY / BULKHEAD_<GROUP>_QUEUE
+# -------------------------------------------------
+DEFAULT_LIMITS = {
+    "interactive": (16, 200),
+    "booking": (8, 100),
+    "search": (6, 50),
+    "bulk": (3, 20),
+}
+
+# Upstream request priority for each tool group
+GROUP_PRIORITIES = {
+    "interactive": PRIORITY_INTERACTIVE,
+    "booking": PRIORITY_BOOKING,
+    "search": PRIORITY_INTERACTIVE,
+    "bulk": PRIORITY_BACKGROUND,
+}
+
+
+class BulkheadFull(Exception):
+    pass
+
+
+class Bulkhead:
+    """
+    Caps how many calls of one tool group run at once.
+    Extra calls wait in a bounded queue; beyond that they are rejected
+    so a burst in one group cannot starve the others.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+
+        self.active = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def acquire(self):
+        waiting = self._semaphore.locked()
+        if waiting:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise BulkheadFull(f"Too many queued '{self.name}' calls, try again shortly")
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+
+        started = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            if waiting:
+                self.queued -= 1
+
+        waited = time.monotonic() - started
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "group": self.name,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(1000 * self.total_wait / self.completed, 1) if self.completed else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait, 1),
+        }
+
+
+_bulkheads: dict[str, Bulkhead] = {}
+
+
+def get_bulkhead(group: str) -> Bulkhead:
+    if group not in _bulkheads:
+        concurrency, queue = DEFAULT_LIMITS.get(group, DEFAULT_LIMITS["interactive"])
+        prefix = f"BULKHEAD_{group.upper()}"
+        _bulkheads[group] = Bulkhead(
+            group,
+            int(os.getenv(f"{prefix}_CONCURRENCY", concurrency)),
+            int(os.getenv(f"{prefix}_QUEUE", queue)),
+        )
+    return _bulkheads[group]
+
+
+def bulkhead(group: str):
+    """
+    Decorator running an async tool inside its group's bulkhead,
+    with upstream requests at the group's priority.
+
+    Each call also gets a deadline (the tool's time budget, or the
+    caller's deadline_seconds) covering queueing, token fetch and every
+    upstream request; work still running at the deadline is cancelled.
+    """
+    priority = GROUP_PRIORITIES.get(group, PRIORITY_INTERACTIVE)
+
+    def decorate(fn):
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        async def wrapper(*args, deadline_seconds: Optional[float] = None, **kwargs):
+            budget = deadline_seconds if deadline_seconds is not None else tool_budget(name, group)
+            with deadline_scope(budget):
+                try:
+                    async with asyncio.timeout(remaining()):
+                        async with get_bulkhead(group).acquire():
+                            with request_priority(priority):
+                                return await fn(*args, **kwargs)
+                except DeadlineExceeded:
+                    raise
+                except TimeoutError as e:
+                    raise DeadlineExceeded(f"{name} did not finish within {budget:g}s") from e
+
+        # Expose deadline_seconds as an optional tool argument
+        signature = inspect.signature(fn)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter(
+                "deadline_seconds",
+                inspect.Parameter.KEYWORD_ONLY,
+                default=None,
+                annotation=Optional[float],
+            ),
+        ])
+        wrapper.__annotations__ = {**fn.__annotations__, "deadline_seconds": Optional[float]}
+        return wrapper
+    return decorate
+
+
+def bulkhead_stats() -> list:
+    return [_bulkheads[group].stats() for group in sorted(_bulkheads)]
@@ -0,0 +1,323 @@
+import argparse
+import fcntl
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Hashable, Optional
+
+
+# -------------------------------------------------
+# In-memory TTL cache
+# -------------------------------------------------
+class TTLCache:
+    """
+    Small in-memory cache with per-entry expiry.
+    Oldest entries are dropped once max_entries is reached.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: dict = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if key not in self._data and len(self._data) >= self.max_entries:
+            self._evict()
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._data.items() if expires_at < now]:
+            del self._data[key]
+
+        # Still full: drop the oldest insertion
+        while len(self._data) >= self.max_entries:
+            del self._data[next(iter(self._data))]
+
+
+# -------------------------------------------------
+# Persistent cache (SQLite)
+# -------------------------------------------------
+# Values at least this large are stored zlib-compressed
+COMPRESS_MIN_BYTES = 512
+
+# Background eviction: total stored bytes and entry age limits
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHE_MAX_AGE = float(os.getenv("CACHE_MAX_AGE", str(30 * 24 * 60 * 60)))
+EVICT_INTERVAL = 5 * 60
+
+
+class PersistentCache:
+    """
+    Key/value store in a local SQLite file that survives restarts and
+    is shared by every process using the same file.
+    Entries without a ttl never expire by themselves; all entries are
+    subject to max_bytes, and to max_age unless it is None. Eviction
+    runs every EVICT_INTERVAL on a background thread, started by the
+    first write, so no write waits for it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = CACHE_MAX_BYTES,
+        max_age: Optional[float] = CACHE_MAX_AGE
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._evictor: Optional[threading.Thread] = None
+        with self._connect() as conn:
+            # WAL lets several processes read while one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_created ON cache (created_at)")
+        conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    @staticmethod
+    def _encode(value: Any):
+        data = json.dumps(value, separators=(",", ":")).encode()
+        if len(data) < COMPRESS_MIN_BYTES:
+            return data.decode()
+        return zlib.compress(data, 6)
+
+    @staticmethod
+    def _decode(stored) -> Any:
+        # Compressed values are BLOBs; small (and older) values are JSON text
+        if isinstance(stored, bytes):
+            stored = zlib.decompress(stored)
+        return json.loads(stored)
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return None
+        return self._decode(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                    (key, self._encode(value), now, now + ttl if ttl else None),
+                )
+        finally:
+            conn.close()
+
+        if self._evictor is None:
+            self._evictor = threading.Thread(target=self._evict_periodically, name="cache-evictor", daemon=True)
+            self._evictor.start()
+
+    def _evict_periodically(self) -> None:
+        while True:
+            try:
+                self.evict()
+            except sqlite3.Error:
+                # Busy or locked by another process: try again next round
+                pass
+            time.sleep(EVICT_INTERVAL)
+
+    def delete(self, key: str) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        finally:
+            conn.close()
+
+    def evict(self) -> dict:
+        """
+        Drop expired entries, entries older than max_age (if set), then
+        the oldest entries until the stored size is under max_bytes.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                if self.max_age is None:
+                    expired = conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,)).rowcount
+                else:
+                    expired = conn.execute(
+                        "DELETE FROM cache WHERE expires_at < ? OR created_at < ?",
+                        (now, now - self.max_age),
+                    ).rowcount
+
+                total = conn.execute("SELECT COALESCE(SUM(length(value)), 0) FROM cache").fetchone()[0]
+                trimmed = 0
+                if total > self.max_bytes:
+                    # Keep the newest entries that fit in 90% of the budget
+                    cutoff = conn.execute(
+                        """
+                        SELECT created_at FROM (
+                            SELECT created_at,
+                                   SUM(length(value)) OVER (ORDER BY created_at DESC) AS running
+                            FROM cache
+                        ) WHERE running > ? ORDER BY created_at DESC LIMIT 1
+                        """,
+                        (int(self.max_bytes * 0.9),),
+                    ).fetchone()
+                    if cutoff:
+                        trimmed = conn.execute("DELETE FROM cache WHERE created_at <= ?", cutoff).rowcount
+        finally:
+            conn.close()
+        return {"expired": expired, "trimmed": trimmed}
+
+    def stats(self) -> dict:
+        now = time.time()
+        conn = self._connect()
+        try:
+            entries, stored, expired, oldest, compressed = conn.execute(
+                """
+                SELECT COUNT(*), COALESCE(SUM(length(value)), 0),
+                       COALESCE(SUM(expires_at < ?), 0), MIN(created_at),
+                       COALESCE(SUM(typeof(value) = 'blob'), 0)
+                FROM cache
+                """,
+                (now,),
+            ).fetchone()
+        finally:
+            conn.close()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "expired": expired,
+            "compressed": compressed,
+            "stored_bytes": stored,
+            "file_bytes": sum(os.path.getsize(p) for p in (self.path, f"{self.path}-wal") if os.path.exists(p)),
+            "oldest_age_seconds": round(now - oldest) if oldest else None,
+            "max_bytes": self.max_bytes,
+        }
+
+    def entries(self, prefix: str = "", limit: int = 50) -> list[dict]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                """
+                SELECT key, length(value), typeof(value) = 'blob', created_at, expires_at
+                FROM cache WHERE key >= ? AND key < ? ORDER BY created_at DESC LIMIT ?
+                """,
+                (prefix, prefix + "\uffff", limit),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {
+                "key": key,
+                "bytes": size,
+                "compressed": bool(compressed),
+                "age_seconds": round(now - created_at),
+                "expires_in_seconds": round(expires_at - now) if expires_at is not None else None,
+            }
+            for key, size, compressed, created_at, expires_at in rows
+        ]
+
+    def purge(self, prefix: str = "", expired_only: bool = False) -> int:
+        sql = "DELETE FROM cache WHERE key >= ? AND key < ?"
+        params: tuple = (prefix, prefix + "\uffff")
+        if expired_only:
+            sql += " AND expires_at < ?"
+            params += (time.time(),)
+
+        conn = self._connect()
+        try:
+            with conn:
+                deleted = conn.execute(sql, params).rowcount
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        return deleted
+
+
+def file_lock(path: str):
+    """
+    Block until an exclusive lock on path is held.
+    Returns the open file; closing it releases the lock.
+    """
+    f = open(path, "a")
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX)
+    except BaseException:
+        f.close()
+        raise
+    return f
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or purge a persistent cache file")
+    parser.add_argument("command", choices=["stats", "list", "purge", "evict"])
+    parser.add_argument(
+        "--db",
+        default=os.getenv("AMADEUS_SHARED_STATE_DB") or str(Path(__file__).resolve().parent / "shared_state.db"),
+    )
+    parser.add_argument("--prefix", default="", help="Only keys starting with this")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--expired", action="store_true", help="purge: only expired entries")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"No cache file at {args.db}")
+    cache = PersistentCache(args.db)
+
+    if args.command == "stats":
+        result = cache.stats()
+    elif args.command == "list":
+        result = cache.entries(args.prefix, args.limit)
+    elif args.command == "evict":
+        result = cache.evict()
+    else:
+        result = {"deleted": cache.purge(args.prefix, args.expired)}
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
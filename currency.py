@@ -0,0 +1,144 @@
+import json
+import os
+import time
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Optional
+
+# -------------------------------------------------
+# Config
+# -------------------------------------------------
+# {"base": "EUR", "updated_at": "...", "rates": {"EUR": 1, "INR": 90.5, ...}}
+# Replace the file (e.g. from a daily cron) to refresh rates; it is
+# re-read when it changes.
+FX_RATES_FILE = os.getenv(
+    "FX_RATES_FILE",
+    str(Path(__file__).resolve().parent / "fx_rates.json"),
+)
+
+# How often to check the rate file for changes (seconds)
+FX_REFRESH_INTERVAL = 5 * 60
+
+# Price fields holding an amount in the price's currency
+AMOUNT_FIELDS = ("total", "base", "grandTotal", "amount")
+
+CENTS = Decimal("0.01")
+
+
+class RateTable:
+    """
+    Exchange rates against one base currency, loaded from a local file.
+    """
+
+    def __init__(self, path: str = FX_RATES_FILE):
+        self.path = path
+        self.base = "EUR"
+        self.updated_at: Optional[str] = None
+        self._rates: dict[str, Decimal] = {}
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self.refresh()
+
+    def refresh(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+
+        with open(self.path, encoding="utf-8") as f:
+            table = json.load(f)
+        self.base = table.get("base", "EUR").upper()
+        self.updated_at = table.get("updated_at")
+        self._rates = {code.upper(): Decimal(str(rate)) for code, rate in table["rates"].items()}
+        self._rates[self.base] = Decimal(1)
+        self._mtime = mtime
+
+    def _maybe_refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at >= FX_REFRESH_INTERVAL:
+            self._checked_at = now
+            self.refresh()
+
+    def supports(self, currency: Optional[str]) -> bool:
+        self._maybe_refresh()
+        return bool(currency) and currency.upper() in self._rates
+
+    def rate(self, source: str, target: str) -> Optional[Decimal]:
+        """
+        Units of target per unit of source, or None if either is unknown.
+        """
+        self._maybe_refresh()
+        source_rate = self._rates.get((source or "").upper())
+        target_rate = self._rates.get((target or "").upper())
+        if source_rate is None or target_rate is None:
+            return None
+        return target_rate / source_rate
+
+
+rates = RateTable()
+
+
+def _convert_value(value: Any, rate: Decimal) -> Any:
+    try:
+        return str((Decimal(str(value)) * rate).quantize(CENTS, rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        return value
+
+
+def convert_price(price: dict, target: str, source: Optional[str] = None) -> dict:
+    """
+    Copy of an Amadeus price object in the target currency.
+    source is used when the price carries no currency of its own.
+    Returned unchanged if either currency is unknown.
+    """
+    currency = price.get("currency") or source
+    if currency and currency.upper() == target.upper():
+        return price if "currency" in price else {**price, "currency": currency}
+
+    rate = rates.rate(currency, target) if currency else None
+    if rate is None:
+        return price
+
+    converted = {}
+    for key, value in price.items():
+        if key in AMOUNT_FIELDS:
+            converted[key] = _convert_value(value, rate)
+        elif isinstance(value, list):
+            # fees / taxes: [{"amount": "...", "type": "..."}]
+            converted[key] = [
+                {**item, "amount": _convert_value(item["amount"], rate)}
+                if isinstance(item, dict) and "amount" in item else item
+                for item in value
+            ]
+        else:
+            converted[key] = value
+    converted["currency"] = target.upper()
+    return converted
+
+
+def convert_response(response: dict, target: Optional[str]) -> dict:
+    """
+    Copy of a search response with each item's price converted.
+    Inspiration and cheapest-date responses carry their currency in meta.
+    """
+    if not target:
+        return response
+    source = response.get("meta", {}).get("currency")
+    converted = {
+        **response,
+        "data": [
+            {**item, "price": convert_price(item["price"], target, source)}
+            if isinstance(item.get("price"), dict) else item
+            for item in response.get("data", [])
+        ],
+    }
+    if source and source.upper() != target.upper() and rates.rate(source, target) is not None:
+        converted["meta"] = {
+            **response.get("meta", {}),
+            "currency": target.upper(),
+            "converted_from": source,
+            "rates_as_of": rates.updated_at,
+        }
+    return converted
@@ -0,0 +1,108 @@
+import asyncio
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+# -------------------------------------------------
+# Time budgets (seconds)
+# Override per tool with TOOL_DEADLINE_<TOOL_NAME>, e.g. TOOL_DEADLINE_CITY_SEARCH=5
+# -------------------------------------------------
+GROUP_BUDGETS = {
+    "interactive": 15.0,
+    "search": 40.0,
+    "booking": 60.0,
+    "bulk": 90.0,
+}
+DEFAULT_BUDGET = 40.0
+
+# Upper bound for a single upstream request
+REQUEST_TIMEOUT = 30.0
+
+# Fan-outs stop waiting this long before the deadline so partial
+# results can still be returned in time
+PARTIAL_RESULT_MARGIN = 1.0
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+def tool_budget(tool_name: str, group: str) -> float:
+    configured = os.getenv(f"TOOL_DEADLINE_{tool_name.upper()}")
+    if configured:
+        return float(configured)
+    return GROUP_BUDGETS.get(group, DEFAULT_BUDGET)
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float], reset: bool = False):
+    """
+    Run the enclosed code with a deadline `seconds` from now.
+    An outer, earlier deadline still wins unless reset is set;
+    reset with seconds=None removes the deadline (background work).
+    """
+    deadline = time.monotonic() + seconds if seconds is not None else None
+    outer = _deadline.get()
+    if outer is not None and not reset:
+        deadline = outer if deadline is None else min(deadline, outer)
+
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """
+    The active deadline as a time.monotonic() value, or None.
+    """
+    return _deadline.get()
+
+
+def remaining(margin: float = 0.0) -> Optional[float]:
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - margin - time.monotonic()
+
+
+def request_timeout(default: float = REQUEST_TIMEOUT) -> float:
+    """
+    Timeout for the next upstream call: the default, capped by the
+    time left. Raises DeadlineExceeded if nothing is left.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Tool deadline exceeded")
+    return min(default, left)
+
+
+async def gather_within_deadline(
+    aws: Iterable[Awaitable],
+    on_timeout: Callable[[int], Any]
+) -> list:
+    """
+    Like asyncio.gather, but stops shortly before the deadline.
+    Unfinished awaitables are cancelled and replaced by on_timeout(index).
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    left = remaining(PARTIAL_RESULT_MARGIN)
+    if left is None or not tasks:
+        return list(await asyncio.gather(*tasks))
+
+    done, pending = await asyncio.wait(tasks, timeout=max(0.0, left))
+    for task in pending:
+        task.cancel()
+
+    return [
+        task.result() if task in done else on_timeout(index)
+        for index, task in enumerate(tasks)
+    ]
@@ -0,0 +1,143 @@
+import numpy as np
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Departure days priced at or below this percentile count as a good window
+WINDOW_PERCENTILE = 25
+
+
+def load_calendar(rows: list[dict]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Turn cheapest-date rows (departure_date, return_date, price) into
+    departure/return datetime64[D] arrays and a float price array.
+    Rows without a usable price or departure date are dropped.
+    """
+    departures, returns, prices = [], [], []
+    for row in rows:
+        try:
+            price = float(row.get("price"))
+        except (TypeError, ValueError):
+            continue
+        if not row.get("departure_date"):
+            continue
+        departures.append(row["departure_date"])
+        returns.append(row.get("return_date") or "NaT")
+        prices.append(price)
+
+    return (
+        np.array(departures, dtype="datetime64[D]"),
+        np.array(returns, dtype="datetime64[D]"),
+        np.array(prices, dtype=np.float64),
+    )
+
+
+def _round(values) -> list:
+    return np.round(values, 2).tolist()
+
+
+def _cheapest_per_group(keys: np.ndarray, price: np.ndarray) -> np.ndarray:
+    """
+    Index of the cheapest row for each distinct key.
+    """
+    order = np.lexsort((price, keys))
+    sorted_keys = keys[order]
+    first = np.empty(sorted_keys.size, dtype=bool)
+    first[0] = True
+    np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=first[1:])
+    return order[first]
+
+
+def _windows(departure: np.ndarray, price: np.ndarray, threshold: float, limit: int) -> list[dict]:
+    """
+    Runs of consecutive departure days whose cheapest fare is at or
+    below threshold, longest and cheapest first.
+    """
+    days, inverse = np.unique(departure, return_inverse=True)
+    day_min = np.full(days.size, np.inf)
+    np.minimum.at(day_min, inverse, price)
+
+    good = day_min <= threshold
+    if not good.any():
+        return []
+
+    # A run starts where a good day is not the day after the previous good day
+    good_days = days[good]
+    good_prices = day_min[good]
+    breaks = np.flatnonzero(np.diff(good_days).astype(np.int64) != 1) + 1
+    starts = np.r_[0, breaks]
+    ends = np.r_[breaks, good_days.size]
+
+    run_min = np.minimum.reduceat(good_prices, starts)
+    lengths = ends - starts
+    ranked = np.lexsort((run_min, -lengths))[:limit]
+
+    return [
+        {
+            "from": str(good_days[starts[i]]),
+            "to": str(good_days[ends[i] - 1]),
+            "days": int(lengths[i]),
+            "min_price": round(float(run_min[i]), 2),
+        }
+        for i in ranked
+    ]
+
+
+def summarize_calendar(rows: list[dict], top: int = 5) -> dict:
+    """
+    Compact statistics over a fare calendar: price percentiles, cheapest
+    fare per stay length and per departure weekday, weekday vs weekend
+    averages, the cheapest cells and the best departure windows.
+    """
+    departure, ret, price = load_calendar(rows)
+    if price.size == 0:
+        return {"cells": 0}
+
+    has_return = ~np.isnat(ret)
+    stay = np.where(has_return, (ret - departure).astype(np.int64), -1)
+
+    # 1970-01-01 was a Thursday; shift so Monday is 0
+    weekday = (departure.astype(np.int64) + 3) % 7
+    weekend = weekday >= 5
+
+    per_stay = _cheapest_per_group(stay, price)
+    per_weekday = _cheapest_per_group(weekday, price)
+    weekday_counts = np.bincount(weekday, minlength=7)
+    weekday_means = np.bincount(weekday, weights=price, minlength=7) / np.maximum(weekday_counts, 1)
+
+    k = min(top, price.size)
+    cheapest = np.argpartition(price, k - 1)[:k]
+    cheapest = cheapest[np.argsort(price[cheapest])]
+
+    bands = np.percentile(price, PERCENTILES)
+
+    return {
+        "cells": int(price.size),
+        "first_departure": str(departure.min()),
+        "last_departure": str(departure.max()),
+        "percentiles": dict(zip((f"p{p}" for p in PERCENTILES), _round(bands))),
+        "cheapest": [
+            {
+                "departure_date": str(departure[i]),
+                "return_date": str(ret[i]) if has_return[i] else None,
+                "price": round(float(price[i]), 2),
+            }
+            for i in cheapest
+        ],
+        "cheapest_by_stay_days": {
+            ("one_way" if stay[i] < 0 else str(int(stay[i]))): round(float(price[i]), 2)
+            for i in per_stay
+        },
+        "by_departure_weekday": {
+            WEEKDAYS[weekday[i]]: {
+                "min": round(float(price[i]), 2),
+                "avg": round(float(weekday_means[weekday[i]]), 2),
+            }
+            for i in sorted(per_weekday, key=lambda i: weekday[i])
+        },
+        "weekday_vs_weekend_avg": {
+            "weekday": round(float(price[~weekend].mean()), 2) if (~weekend).any() else None,
+            "weekend": round(float(price[weekend].mean()), 2) if weekend.any() else None,
+        },
+        "best_windows": _windows(departure, price, bands[PERCENTILES.index(WINDOW_PERCENTILE)], top),
+    }
@@ -0,0 +1,276 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import httpx
+
+from amadeus import get_flight_status
+from deadline import deadline_scope
+from scheduler import PRIORITY_BACKGROUND, SchedulerOverloaded, request_priority
+
+# -------------------------------------------------
+# Polling policy
+# -------------------------------------------------
+# (seconds until departure, poll interval) - first match wins
+POLL_SCHEDULE = [
+    (2 * 60 * 60, 5 * 60),
+    (12 * 60 * 60, 15 * 60),
+    (48 * 60 * 60, 60 * 60),
+]
+POLL_INTERVAL_FAR = 6 * 60 * 60
+POLL_INTERVAL_ERROR = 10 * 60
+
+# Stop watching this long after scheduled arrival
+WATCH_EXPIRY_AFTER_ARRIVAL = 2 * 60 * 60
+
+# Stop watching a flight Amadeus never reported this long after its departure date
+WATCH_EXPIRY_WITHOUT_STATUS = 24 * 60 * 60
+
+# Local times without an offset could be anywhere from UTC-12 to UTC+14
+EARLIEST_UTC_OFFSET = timedelta(hours=-12)
+LATEST_UTC_OFFSET = timedelta(hours=14)
+
+# Gap between upstream calls so a burst stays under the sandbox rate limit
+REQUEST_SPACING = 0.2
+
+MAX_PENDING_CHANGES = 1000
+
+# Fields kept per flight, in this order
+STATE_FIELDS = (
+    "status",
+    "departure_terminal",
+    "departure_gate",
+    "departure_time",
+    "arrival_terminal",
+    "arrival_gate",
+    "arrival_time",
+)
+
+
+def compact_state(flight: dict) -> tuple:
+    """
+    Reduce one flight status record to a tuple ordered as STATE_FIELDS.
+    """
+    departure = flight.get("departure", {})
+    arrival = flight.get("arrival", {})
+    return (
+        flight.get("status"),
+        departure.get("terminal"),
+        departure.get("gate"),
+        departure.get("scheduledTimeLocal"),
+        arrival.get("terminal"),
+        arrival.get("gate"),
+        arrival.get("scheduledTimeLocal"),
+    )
+
+
+def diff_states(old: tuple, new: tuple) -> dict:
+    return {
+        field: {"old": before, "new": after}
+        for field, before, after in zip(STATE_FIELDS, old, new)
+        if before != after
+    }
+
+
+def _parse_local(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    for text in (value, value[:19]):
+        try:
+            return datetime.fromisoformat(text)
+        except ValueError:
+            pass
+    return None
+
+
+def _to_utc(moment: datetime, latest: bool) -> datetime:
+    """
+    UTC instant of an airport-local time. Without an offset, take the
+    earliest (or latest) instant it could stand for, so polling errs
+    towards too early and expiry towards too late.
+    """
+    if moment.tzinfo is not None:
+        return moment.astimezone(timezone.utc)
+    offset = EARLIEST_UTC_OFFSET if latest else LATEST_UTC_OFFSET
+    return (moment - offset).replace(tzinfo=timezone.utc)
+
+
+class _Watch:
+    __slots__ = ("carrier_code", "flight_number", "departure_date",
+                 "state", "next_poll", "last_polled", "last_error")
+
+    def __init__(self, carrier_code: str, flight_number: str, departure_date: str):
+        self.carrier_code = carrier_code
+        self.flight_number = flight_number
+        self.departure_date = departure_date
+        self.state: Optional[tuple] = None
+        self.next_poll = 0.0
+        self.last_polled: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.carrier_code}{self.flight_number}:{self.departure_date}"
+
+    def departure(self) -> Optional[datetime]:
+        if self.state and self.state[3]:
+            return _parse_local(self.state[3])
+        return _parse_local(self.departure_date)
+
+    def arrival(self) -> Optional[datetime]:
+        return _parse_local(self.state[6]) if self.state else None
+
+    def interval(self, now: datetime) -> float:
+        """
+        now is timezone-aware UTC, as are all comparisons here.
+        """
+        departure = self.departure()
+        if departure is None:
+            return POLL_INTERVAL_FAR
+
+        until_departure = (_to_utc(departure, latest=False) - now).total_seconds()
+        for threshold, interval in POLL_SCHEDULE:
+            if until_departure <= threshold:
+                return interval
+        return POLL_INTERVAL_FAR
+
+    def expired(self, now: datetime) -> bool:
+        arrival = self.arrival()
+        if arrival is not None:
+            return (now - _to_utc(arrival, latest=True)).total_seconds() > WATCH_EXPIRY_AFTER_ARRIVAL
+
+        # No status yet: give up a day after the departure date has ended
+        day = _parse_local(self.departure_date)
+        if day is None:
+            return False
+        end_of_day = _to_utc(day.replace(tzinfo=None) + timedelta(days=1), latest=True)
+        return (now - end_of_day).total_seconds() > WATCH_EXPIRY_WITHOUT_STATUS
+
+
+# -------------------------------------------------
+# Watcher
+# -------------------------------------------------
+class FlightWatcher:
+    """
+    Polls registered flights on an adaptive schedule and keeps
+    only the changes since the previous poll.
+    """
+
+    def __init__(self, fetch=get_flight_status, request_spacing: float = REQUEST_SPACING):
+        self._fetch = fetch
+        self._request_spacing = request_spacing
+        self._watches: dict[str, _Watch] = {}
+        self._changes: list[dict] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def watch(self, carrier_code: str, flight_number: str, departure_date: str) -> str:
+        watch = _Watch(carrier_code.upper(), flight_number, departure_date)
+        self._watches.setdefault(watch.key, watch)
+        self._ensure_running()
+        self._wakeup.set()
+        return watch.key
+
+    def unwatch(self, carrier_code: str, flight_number: str, departure_date: str) -> bool:
+        key = _Watch(carrier_code.upper(), flight_number, departure_date).key
+        return self._watches.pop(key, None) is not None
+
+    def watched(self) -> list:
+        now = time.monotonic()
+        return [
+            {
+                "watch_id": w.key,
+                "state": dict(zip(STATE_FIELDS, w.state)) if w.state else None,
+                "next_poll_in": max(0, round(w.next_poll - now)),
+                "last_error": w.last_error,
+            }
+            for w in self._watches.values()
+        ]
+
+    def drain_changes(self) -> list:
+        changes, self._changes = self._changes, []
+        return changes
+
+    async def poll_due(self) -> list:
+        """
+        Poll every watch whose interval has elapsed, spacing the
+        upstream calls. Returns the changes found in this pass.
+        Changes are queued as soon as they are found, so a pass cut
+        short (e.g. by the caller's deadline) loses none of them.
+        """
+        now = time.monotonic()
+        due = [w for w in self._watches.values() if w.next_poll <= now]
+        for watch in due:
+            # Claim it so a concurrent pass does not poll it again
+            watch.next_poll = now + POLL_INTERVAL_ERROR
+
+        found = []
+        polled = 0
+        try:
+            for watch in due:
+                if polled:
+                    await asyncio.sleep(self._request_spacing)
+                change = await self._poll(watch)
+                polled += 1
+                if change:
+                    found.append(change)
+                    self._changes.append(change)
+                    del self._changes[:-MAX_PENDING_CHANGES]
+        finally:
+            # Give back the claim on watches this pass never reached
+            if polled < len(due):
+                for watch in due[polled:]:
+                    watch.next_poll = now
+                self._wakeup.set()
+        return found
+
+    async def _poll(self, watch: _Watch) -> Optional[dict]:
+        watch.last_polled = time.time()
+        try:
+            data = await self._fetch(watch.carrier_code, watch.flight_number, watch.departure_date)
+        except (httpx.HTTPError, SchedulerOverloaded, TimeoutError) as e:
+            watch.last_error = str(e)
+            watch.next_poll = time.monotonic() + POLL_INTERVAL_ERROR
+            if watch.expired(datetime.now(timezone.utc)):
+                self._watches.pop(watch.key, None)
+            return None
+
+        watch.last_error = None
+        flights = data.get("data", [])
+        previous = watch.state
+        if flights:
+            watch.state = compact_state(flights[0])
+
+        now = datetime.now(timezone.utc)
+        watch.next_poll = time.monotonic() + watch.interval(now)
+        if watch.expired(now):
+            self._watches.pop(watch.key, None)
+
+        if watch.state is None or watch.state == previous:
+            return None
+
+        if previous is None:
+            return {"watch_id": watch.key, "initial": True,
+                    "state": dict(zip(STATE_FIELDS, watch.state))}
+        return {"watch_id": watch.key, "changes": diff_states(previous, watch.state)}
+
+    async def run(self) -> None:
+        while self._watches:
+            await self.poll_due()
+
+            next_poll = min((w.next_poll for w in self._watches.values()), default=None)
+            if next_poll is None:
+                break
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(0, next_poll - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            # Polling is background work, not bound to the caller's deadline
+            with request_priority(PRIORITY_BACKGROUND), deadline_scope(None, reset=True):
+                self._task = asyncio.get_running_loop().create_task(self.run())
@@ -1,7 +1,11 @@
+import asyncio
+import httpx
+
 from fastmcp import FastMCP
 from amadeus import (
     search_multicity_india,
     price_flight_offer,
+    price_flight_offers,
     get_seatmap_from_flight_offer,
     get_seatmap_from_order,
     create_flight_order,
@@ -10,6 +14,7 @@ from amadeus import (
     get_flight_inspiration,
     get_cheapest_flight_dates,
     get_flight_availability,
+    get_flight_availabilities,
     get_flight_status,
     get_flight_checkin_links,
     get_airline_name,
@@ -17,51 +22,233 @@ from amadeus import (
     search_activities,
     search_activities_by_square,
     get_activity_by_id,
+    get_activities_by_ids,
     search_cities
 )
+from bulkhead import bulkhead, bulkhead_stats
+from deadline import GROUP_BUDGETS, deadline_scope, gather_within_deadline
+from scheduler import PRIORITY_BACKGROUND, SchedulerOverloaded, request_priority, scheduler
+from cache import TTLCache
+from currency import convert_price
+from fare_analytics import summarize_calendar
+from flight_watch import FlightWatcher
+from offer_model import FlightOffer, offer_key, offer_ref
+from offer_ranking import rank_offers
+from price_history import PriceHistoryStore
+from route_graph import RouteGraph
+from seatmap import compact_seatmap, diff_seatmaps
+from tracing import enable_tracing
+from warmup import warmup_lifespan, warmup_status
+
+
+flight_watcher = FlightWatcher()
+price_history = PriceHistoryStore()
+route_graph = RouteGraph()
+
+mcp = FastMCP("amadeus-flight-mcp", lifespan=warmup_lifespan(route_graph))
+enable_tracing(mcp)
+
+# Offers from recent searches by offer_ref, so later tools can take an
+# offer_id (upstream IDs restart at "1" on every search)
+_recent_offers = TTLCache(ttl=30 * 60)
+
+# Last compact seatmap per segment, for mode="diff"
+_seatmaps_seen = TTLCache(ttl=24 * 60 * 60)
+
+SEATMAP_MODES = ("raw", "compact", "diff")
+
 
+def _check_seatmap_mode(mode: str) -> None:
+    # Checked before fetching, so a typo costs no upstream call
+    if mode not in SEATMAP_MODES:
+        raise ValueError('mode must be "raw", "compact" or "diff"')
 
-mcp = FastMCP("amadeus-flight-mcp")
+
+def _seatmap_response(seatmaps: list, mode: str):
+    if mode == "raw":
+        return seatmaps
+
+    compact = [compact_seatmap(seatmap) for seatmap in seatmaps]
+    if mode == "compact":
+        for item in compact:
+            _seatmaps_seen.set(item["segment"], item)
+        return compact
+
+    results = []
+    for item in compact:
+        previous = _seatmaps_seen.get(item["segment"])
+        _seatmaps_seen.set(item["segment"], item)
+        results.append(diff_seatmaps(previous, item) if previous else {**item, "first_fetch": True})
+    return results
 
 # -------------------------
 # Search: Multi-city India
 # -------------------------
+def _remember_offers(offers: list[dict]) -> list[FlightOffer]:
+    # Kept in compact form so later tools can take an offer ID
+    models = [FlightOffer(offer) for offer in offers]
+    for model in models:
+        _recent_offers.set(offer_ref(model.key), model)
+    return models
+
+
+def _offer_summary(offer: FlightOffer, currency: str | None = None) -> dict:
+    price = {"grandTotal": offer.grand_total, "currency": offer.currency}
+    shown = convert_price(price, currency) if currency else price
+
+    summary = {
+        "price": shown["grandTotal"],
+        "currency": shown["currency"],
+        "airlines": sorted(offer.carriers),
+    }
+    if shown is not price:
+        # The offer itself (used for pricing and booking) stays in its own currency
+        summary["offer_price"] = offer.grand_total
+        summary["offer_currency"] = offer.currency
+    return summary
+
+
+@mcp.tool()
+@bulkhead("search")
+async def search_india_multicity_flights(currency: str | None = None, max_offers: int = 5):
+    """
+    currency: show summary prices converted to this currency (e.g. "USD");
+    converting does not trigger a new search.
+    max_offers: up to 250
+    """
+    data = await search_multicity_india(max_offers)
+    offers = data.get("data", [])
+
+    return [
+        {"offer_id": offer_ref(model.key), "summary": _offer_summary(model, currency), "flight_offer": offer}
+        for model, offer in zip(_remember_offers(offers), offers)
+    ]
+
+
+@mcp.tool()
+@bulkhead("search")
+async def search_ranked_flights(
+    top_k: int = 10,
+    max_offers: int = 100,
+    price_weight: float = 1.0,
+    duration_weight: float = 0.5,
+    stops_weight: float = 0.3,
+    departure_weight: float = 0.0,
+    arrival_weight: float = 0.0,
+    dedup: bool = True,
+    currency: str | None = None
+):
+    """
+    Multi-city search scored on price, total duration, stops and
+    time of day, returning the best top_k with near-duplicate
+    itineraries removed. Weights are relative; a negative
+    departure/arrival weight prefers later times.
+    """
+    data = await search_multicity_india(max_offers)
+    offers = data.get("data", [])
+    models = _remember_offers(offers)
+
+    result = rank_offers(
+        offers,
+        k=top_k,
+        dedup=dedup,
+        weights={
+            "price": price_weight,
+            "duration": duration_weight,
+            "stops": stops_weight,
+            "departure": departure_weight,
+            "arrival": arrival_weight,
+        },
+    )
+    for entry in result["ranked"]:
+        model = models[entry.pop("index")]
+        entry["offer_id"] = offer_ref(model.key)
+        summary = _offer_summary(model, currency)
+        del summary["airlines"]
+        entry.update(summary)
+    return result
+
+
+# -------------------------
+# Search + speculative pricing
+# -------------------------
+SPECULATIVE_PRICE_TTL = 10 * 60
+
+# A prefetch still queued behind other work after this long is not
+# waited for; the offer is priced directly at booking priority instead
+SPECULATIVE_JOIN_TIMEOUT = 2.0
+
+# Offer fingerprint -> background pricing task
+_speculative_prices = TTLCache(ttl=SPECULATIVE_PRICE_TTL)
+
+def _start_speculative_pricing(offers: list[dict]) -> None:
+    # Prefetch must not delay real pricing or booking calls, and gets
+    # its own budget rather than the search call's deadline
+    with request_priority(PRIORITY_BACKGROUND), deadline_scope(GROUP_BUDGETS["booking"], reset=True):
+        batch = asyncio.ensure_future(price_flight_offers(offers))
+
+    async def priced(index: int) -> dict:
+        try:
+            results = await batch
+        except Exception as e:
+            return {"id": offers[index].get("id"), "error": str(e)}
+        return results[index]
+
+    for index, offer in enumerate(offers):
+        _speculative_prices.set(offer_key(offer), asyncio.ensure_future(priced(index)))
+
+
 @mcp.tool()
-async def search_india_multicity_flights():
+@bulkhead("search")
+async def search_and_prefetch_prices(top_n: int = 3, rank_by: str = "price", currency: str | None = None):
+    """
+    Multi-city search that also starts pricing the top_n offers in the
+    background. A later price_selected_flight for one of them returns
+    the prefetched price, or waits for the pricing already in flight.
+    rank_by: "price" or "duration"
+    currency: show summary prices converted to this currency
+    """
     data = await search_multicity_india()
-    results = []
+    offers = data.get("data", [])
+    models = _remember_offers(offers)
 
-    for offer in data.get("data", []):
-        results.append({
-            "summary": {
-                "price": offer["price"]["grandTotal"],
-                "currency": offer["price"]["currency"],
-                "airlines": list({
-                    seg["carrierCode"]
-                    for itin in offer["itineraries"]
-                    for seg in itin["segments"]
-                }),
-            },
-            "flight_offer": offer
-        })
+    if rank_by == "duration":
+        order = sorted(range(len(offers)), key=lambda i: models[i].duration_minutes)
+    else:
+        order = sorted(range(len(offers)), key=lambda i: models[i].price)
 
-    return results
+    prefetch = [offers[i] for i in order[:top_n] if _speculative_prices.get(models[i].key) is None]
+    if prefetch:
+        _start_speculative_pricing(prefetch)
+
+    return [
+        {
+            "offer_id": offer_ref(models[i].key),
+            "summary": _offer_summary(models[i], currency),
+            "flight_offer": offers[i],
+            "price_prefetched": rank < top_n,
+        }
+        for rank, i in enumerate(order)
+    ]
 
 
 # -------------------------
 # Flight Inspiration
 # -------------------------
-@mcp.tool()
-async def flight_inspiration_search(
-    origin: str,
-    max_price: int = 10000,
-    currency: str = "INR",
-    departure_date: str | None = None
-):
-    response = await get_flight_inspiration(
-        origin, max_price, currency, departure_date
-    )
+def _with_age(response: dict, rows: list[dict]) -> dict:
+    # Cached answers carry meta.cache; fresh ones are zero seconds old
+    cache = response.get("meta", {}).get("cache", {})
+    result = {
+        "results": rows,
+        "age_seconds": cache.get("age_seconds", 0),
+        "stale": cache.get("stale", False),
+    }
+    if "warning" in response:
+        result["warning"] = response["warning"]
+    return result
 
+
+def _inspiration_rows(response: dict) -> list[dict]:
     return [
         {
             "destination": item.get("destination"),
@@ -74,21 +261,34 @@ async def flight_inspiration_search(
     ]
 
 
-# -------------------------
-# Cheapest Dates
-# -------------------------
 @mcp.tool()
-async def flight_cheapest_date_search(
+@bulkhead("search")
+async def flight_inspiration_search(
     origin: str,
-    destination: str,
-    currency: str = "INR"
+    max_price: int = 10000,
+    currency: str = "INR",
+    departure_date: str | None = None
 ):
-    response = await get_cheapest_flight_dates(
-        origin, destination, currency
+    """
+    Destinations from origin under max_price. age_seconds and stale
+    tell how old the (possibly cached) prices are.
+    """
+    # Price history records each upstream fetch, background refreshes
+    # included, rather than every cached answer
+    response = await get_flight_inspiration(
+        origin, max_price, currency, departure_date,
+        on_fetch=lambda data: price_history.record("inspiration", origin, _inspiration_rows(data))
     )
+    return _with_age(response, _inspiration_rows(response))
 
+
+# -------------------------
+# Cheapest Dates
+# -------------------------
+def _cheapest_date_rows(response: dict, destination: str) -> list[dict]:
     return [
         {
+            "destination": destination,
             "departure_date": item.get("departureDate"),
             "return_date": item.get("returnDate"),
             "price": item.get("price", {}).get("total"),
@@ -98,10 +298,114 @@ async def flight_cheapest_date_search(
     ]
 
 
+def _record_cheapest_dates(origin: str, destination: str):
+    return lambda data: price_history.record("cheapest_dates", origin, _cheapest_date_rows(data, destination))
+
+
+@mcp.tool()
+@bulkhead("search")
+async def flight_cheapest_date_search(
+    origin: str,
+    destination: str,
+    currency: str = "INR"
+):
+    """
+    Cheapest travel dates for a route. age_seconds and stale tell how
+    old the (possibly cached) prices are.
+    """
+    response = await get_cheapest_flight_dates(
+        origin, destination, currency,
+        on_fetch=_record_cheapest_dates(origin, destination)
+    )
+    return _with_age(response, _cheapest_date_rows(response, destination))
+
+
+# -------------------------
+# Fare Calendar Analytics
+# -------------------------
+@mcp.tool()
+@bulkhead("bulk")
+async def fare_calendar_analytics(
+    routes: list[str],
+    currency: str = "INR",
+    top: int = 5
+):
+    """
+    Summarize cheapest-date calendars instead of listing every row:
+    percentiles, cheapest fare per stay length and weekday,
+    weekday vs weekend prices and the best departure windows.
+    routes: ["DEL-BOM", "MAD-MUC"]
+    """
+    async def analyze(route: str):
+        origin, _, destination = route.upper().partition("-")
+        try:
+            response = await get_cheapest_flight_dates(
+                origin, destination, currency,
+                on_fetch=_record_cheapest_dates(origin, destination)
+            )
+        except (httpx.HTTPError, SchedulerOverloaded) as e:
+            # One unsupported route must not fail the others
+            return {"route": route, "error": str(e)}
+        rows = _cheapest_date_rows(response, destination)
+
+        summary = {"route": route, "currency": currency, **summarize_calendar(rows, top)}
+        cache = response.get("meta", {}).get("cache")
+        if cache:
+            summary["data_age_seconds"] = cache["age_seconds"]
+        return summary
+
+    def timed_out(index: int) -> dict:
+        return {"route": routes[index], "error": "Deadline exceeded"}
+
+    return await gather_within_deadline((analyze(route) for route in routes), timed_out)
+
+
+# -------------------------
+# Price History
+# -------------------------
+@mcp.tool()
+async def price_history_cheapest(
+    origin: str,
+    destination: str,
+    currency: str = "INR",
+    max_age_days: float = 7
+):
+    """
+    Cheapest locally recorded price for a route, from earlier
+    inspiration and cheapest-date searches. No upstream call.
+    """
+    result = await price_history.cheapest(origin, destination, currency, max_age_days)
+    return result or {"message": "No recorded prices for this route in that window"}
+
+
+@mcp.tool()
+async def price_history_trend(
+    origin: str,
+    destination: str,
+    currency: str = "INR",
+    departure_date: str | None = None,
+    days: int = 30
+):
+    """
+    Daily minimum/average recorded price for a route.
+    Answers "has this gotten cheaper?" without re-querying.
+    """
+    return await price_history.trend(origin, destination, currency, departure_date, days)
+
+
+@mcp.tool()
+async def price_history_staleness(origin: str, destination: str | None = None):
+    """
+    How old the newest recorded price is per destination.
+    """
+    return await price_history.staleness(origin, destination)
+
+
 # -------------------------
 # Flight Availability
 # -------------------------
 @mcp.tool()
+@bulkhead("search")
 async def check_flight_availability(
     origin: str,
     destination: str,
@@ -133,14 +437,71 @@ async def check_flight_availability(
     return results
 
 
+
+def _seats_by_class(item: dict) -> dict:
+    """
+    Bookable seats per booking class for a whole journey: for
+    connections, the lowest count across its segments.
+    """
+    seats: dict = {}
+    for index, segment in enumerate(item.get("segments", [])):
+        classes = {
+            c.get("class"): c.get("numberOfBookableSeats", 0)
+            for c in segment.get("availabilityClasses", [])
+        }
+        if index == 0:
+            seats = classes
+        else:
+            seats = {cls: min(n, classes[cls]) for cls, n in seats.items() if cls in classes}
+    return seats
+
+
+@mcp.tool()
+@bulkhead("bulk")
+async def flight_availability_matrix(
+    routes: list[str],
+    dates: list[str],
+    airline: str | None = None
+):
+    """
+    Seats by booking class for every flight on every route and date.
+    routes: ["DEL-BOM", "BOM-BLR"]; dates: ["2026-10-03", "2026-10-04"]
+    Legs are batched several per upstream request and run concurrently.
+    Result: {route: {date: {"AI101 07:00": {"J": 4, "Y": 9}}}}
+    """
+    legs = []
+    for route in routes:
+        origin, _, destination = route.upper().partition("-")
+        legs.extend((origin, destination, date) for date in dates)
+
+    matrix: dict = {}
+    errors = []
+    for result in await get_flight_availabilities(legs, airline):
+        origin, destination, date = result["leg"]
+        route = f"{origin}-{destination}"
+        if "error" in result:
+            errors.append({"route": route, "date": date, "error": result["error"]})
+            continue
+
+        flights = matrix.setdefault(route, {}).setdefault(date, {})
+        for item in result["data"]:
+            segments = item.get("segments", [])
+            if not segments:
+                continue
+            flight = "+".join(f"{seg.get('carrierCode')}{seg.get('number')}" for seg in segments)
+            departs = (segments[0].get("departure", {}).get("at") or "")[11:16]
+            flights[f"{flight} {departs}".strip()] = _seats_by_class(item)
+
+    response = {"matrix": matrix}
+    if errors:
+        response["errors"] = errors
+    return response
+
+
 # -------------------------
 # Pricing
 # -------------------------
-@mcp.tool()
-async def price_selected_flight(flight_offer: dict):
-    pricing = await price_flight_offer(flight_offer)
-    priced = pricing["data"]["flightOffers"][0]
-
+def _priced_summary(priced: dict) -> dict:
     return {
         "priced_flight_offer": priced,
         "currency": priced["price"]["currency"],
@@ -151,19 +512,91 @@ async def price_selected_flight(flight_offer: dict):
     }
 
 
+@mcp.tool()
+@bulkhead("booking")
+async def price_selected_flight(flight_offer: dict):
+    speculative = _speculative_prices.get(offer_key(flight_offer))
+    if speculative is not None:
+        done, _ = await asyncio.wait({speculative}, timeout=SPECULATIVE_JOIN_TIMEOUT)
+        result = speculative.result() if done else {}
+        if "priced" in result:
+            return {**_priced_summary(result["priced"]), "prefetched": True}
+
+    pricing = await price_flight_offer(flight_offer)
+    priced = pricing["data"]["flightOffers"][0]
+
+    return _priced_summary(priced)
+
+
+@mcp.tool()
+@bulkhead("booking")
+async def price_flight_offers_batch(flight_offers: list[dict | str]):
+    """
+    Re-price a shortlist in one go. Each item is a flight offer dict
+    or the offer_id of an offer from a recent search.
+    Reports the change against each offer's original grandTotal.
+    """
+    offers = []
+    results: list = [None] * len(flight_offers)
+    # Offer IDs restart at "1" on every search; offer_key does not
+    positions: dict[tuple, list[int]] = {}
+    # Reported as given: offer_id for IDs, the upstream ID for dicts
+    labels: list = [None] * len(flight_offers)
+
+    for index, item in enumerate(flight_offers):
+        offer = _recent_offers.get(item) if isinstance(item, str) else item
+        if offer is None:
+            results[index] = {"offer_id": item, "error": "Unknown offer ID; run a search first"}
+            continue
+        if isinstance(offer, FlightOffer):
+            offer = offer.to_json()
+        labels[index] = item if isinstance(item, str) else offer.get("id")
+        key = offer_key(offer)
+        if key not in positions:
+            offers.append(offer)
+        positions.setdefault(key, []).append(index)
+
+    for original, result in zip(offers, await price_flight_offers(offers)):
+        if "error" in result:
+            summary = {"error": result["error"]}
+        else:
+            priced = _priced_summary(result["priced"])
+            original_total = original.get("price", {}).get("grandTotal")
+            summary = {
+                **priced,
+                "original_total": original_total,
+                "price_change": (
+                    round(float(priced["total_price"]) - float(original_total), 2)
+                    if original_total is not None else None
+                ),
+            }
+        for index in positions[offer_key(original)]:
+            results[index] = {"offer_id": labels[index], **summary}
+
+    return results
+
+
 # -------------------------
 # SeatMap (pre-booking)
 # -------------------------
 @mcp.tool()
-async def show_seatmap_for_flight(flight_offer: dict):
-    response = await get_seatmap_from_flight_offer(flight_offer)
-    return response.get("data", [])
+@bulkhead("search")
+async def show_seatmap_for_flight(flight_offer: dict, mode: str = "raw"):
+    """
+    Seat map for each segment of a flight offer.
+    mode: "raw" (full Amadeus JSON), "compact" (row grid + seat tables)
+    or "diff" (seats changed since the previous fetch).
+    """
+    _check_seatmap_mode(mode)
+    response = await get_seatmap_from_flight_offer(flight_offer, use_cache=mode != "diff")
+    return _seatmap_response(response.get("data", []), mode)
 
 
 # -------------------------
 # Booking
 # -------------------------
 @mcp.tool()
+@bulkhead("booking")
 async def create_flight_booking(priced_flight_offer: dict):
     order = (await create_flight_order(priced_flight_offer))["data"]
     records = order.get("associatedRecords", [])
@@ -180,6 +613,7 @@ async def create_flight_booking(priced_flight_offer: dict):
 # Retrieve Booking
 # -------------------------
 @mcp.tool()
+@bulkhead("booking")
 async def retrieve_flight_booking(order_id: str):
     order = (await retrieve_flight_order(order_id))["data"]
     records = order.get("associatedRecords", [])
@@ -197,14 +631,21 @@ async def retrieve_flight_booking(order_id: str):
 # SeatMap (post-booking)
 # -------------------------
 @mcp.tool()
-async def show_seatmap_for_booking(order_id: str):
-    return (await get_seatmap_from_order(order_id)).get("data", [])
+@bulkhead("search")
+async def show_seatmap_for_booking(order_id: str, mode: str = "raw"):
+    """
+    Seat map for a booked order. Same modes as show_seatmap_for_flight.
+    """
+    _check_seatmap_mode(mode)
+    response = await get_seatmap_from_order(order_id, use_cache=mode != "diff")
+    return _seatmap_response(response.get("data", []), mode)
 
 
 # -------------------------
 # Cancel Booking
 # -------------------------
 @mcp.tool()
+@bulkhead("booking")
 async def cancel_flight_booking(order_id: str):
     order = (await cancel_flight_order(order_id))["data"]
     return {
@@ -217,6 +658,7 @@ async def cancel_flight_booking(order_id: str):
 # -------------------------------
 
 @mcp.tool()
+@bulkhead("interactive")
 async def flight_status(
     carrier_code: str,
     flight_number: str,
@@ -260,11 +702,62 @@ async def flight_status(
 
     return results
 
+# -------------------------------
+# Flight Status Watch
+# -------------------------------
+
+@mcp.tool()
+async def watch_flight(
+    carrier_code: str,
+    flight_number: str,
+    departure_date: str
+):
+    """
+    Start tracking a flight. It is polled in the background,
+    more often as departure gets closer.
+    Use watched_flight_changes to collect what changed.
+    """
+    watch_id = flight_watcher.watch(carrier_code, flight_number, departure_date)
+    return {"watch_id": watch_id, "watching": len(flight_watcher.watched())}
+
+
+@mcp.tool()
+async def unwatch_flight(
+    carrier_code: str,
+    flight_number: str,
+    departure_date: str
+):
+    """
+    Stop tracking a flight.
+    """
+    return {"removed": flight_watcher.unwatch(carrier_code, flight_number, departure_date)}
+
+
+@mcp.tool()
+async def list_watched_flights():
+    """
+    List tracked flights with their last known state.
+    """
+    return flight_watcher.watched()
+
+
+@mcp.tool()
+@bulkhead("interactive")
+async def watched_flight_changes(poll_now: bool = False):
+    """
+    Return gate, terminal, time and status changes seen since the last call.
+    poll_now also polls every flight whose interval has elapsed.
+    """
+    if poll_now:
+        await flight_watcher.poll_due()
+    return flight_watcher.drain_changes()
+
 # -------------------------------------------------
 # Check-in Links
 # -------------------------------------------------
 
 @mcp.tool()
+@bulkhead("interactive")
 async def get_airline_checkin_link(
     airline_code: str,
     language: str = "EN"
@@ -295,6 +788,7 @@ async def get_airline_checkin_link(
 
 
 @mcp.tool()
+@bulkhead("interactive")
 async def airline_code_lookup(codes: list[str]):
     """
     Get airline names from IATA or ICAO codes.
@@ -318,6 +812,7 @@ async def airline_code_lookup(codes: list[str]):
 # Airline Routes MCP Tool
 # -------------------------------------------------
 @mcp.tool()
+@bulkhead("interactive")
 async def airline_routes(airline_code: str):
     """
     Returns all destinations served by an airline.
@@ -333,16 +828,55 @@ async def airline_routes(airline_code: str):
             "country": item.get("address", {}).get("countryName"),
         })
 
+    route_graph.add_airline(airline_code, [r["iata_code"] for r in results])
+
     return {
         "airline_code": airline_code,
         "destinations": results
     }
 
+
+@mcp.tool()
+@bulkhead("bulk")
+async def build_route_graph(airline_codes: list[str]):
+    """
+    Load the destination networks of several airlines into the
+    local route graph. Carriers fetched within the last week are skipped.
+    Example: ["EK", "AI", "6E", "QR"]
+    """
+    return await route_graph.ensure(airline_codes)
+
+
+@mcp.tool()
+@bulkhead("bulk")
+async def find_route_connections(
+    origin: str,
+    destination: str,
+    max_stops: int = 1,
+    k: int = 5,
+    airline_codes: list[str] | None = None
+):
+    """
+    Feasible hub/carrier combinations between two places, from the
+    local route graph. Use it to prune routings before a flight search.
+    airline_codes are loaded into the graph first if not already known.
+    """
+    if airline_codes:
+        await route_graph.ensure(airline_codes)
+
+    return {
+        "origin": origin,
+        "destination": destination,
+        "min_flights": route_graph.shortest_hops(origin, destination, max_stops),
+        "connections": route_graph.connections(origin, destination, max_stops, k),
+    }
+
 # ---------------------------------------------------------
 # Tours & Activities MCP Tools
 # ---------------------------------------------------------
 
 @mcp.tool()
+@bulkhead("interactive")
 async def find_activities_nearby(
     latitude: float,
     longitude: float,
@@ -369,6 +903,7 @@ async def find_activities_nearby(
 
 
 @mcp.tool()
+@bulkhead("bulk")
 async def find_activities_by_area(
     north: float,
     south: float,
@@ -392,6 +927,7 @@ async def find_activities_by_area(
 
 
 @mcp.tool()
+@bulkhead("interactive")
 async def get_activity_details(activity_id: str):
     """
     Get full details of one activity.
@@ -399,11 +935,22 @@ async def get_activity_details(activity_id: str):
     data = await get_activity_by_id(activity_id)
     return data.get("data")
 
+
+@mcp.tool()
+@bulkhead("bulk")
+async def get_activity_details_bulk(activity_ids: list[str]):
+    """
+    Get full details of several activities in one call.
+    Results follow the input order; failed IDs carry an "error" field.
+    """
+    return await get_activities_by_ids(activity_ids)
+
 # ---------------------------------------------------------
 # City Search MCP Tool
 # ---------------------------------------------------------
 
 @mcp.tool()
+@bulkhead("interactive")
 async def city_search(keyword: str):
     """
     Find cities matching a keyword (autocomplete).
@@ -426,6 +973,26 @@ async def city_search(keyword: str):
 
     return results
 
+# ---------------------------------------------------------
+# Server Metrics
+# ---------------------------------------------------------
+
+@mcp.tool()
+async def concurrency_stats():
+    """
+    Per tool-group concurrency limits, queue depth and wait times,
+    plus the upstream request scheduler's state.
+    """
+    return {"tool_groups": bulkhead_stats(), "upstream": scheduler.stats()}
+
+@mcp.tool()
+async def server_readiness():
+    """
+    Startup warm-up progress: whether the token, pooled connection and
+    preloaded reference data are ready, with per-step timings.
+    """
+    return warmup_status()
+
 if __name__ == "__main__":
     try:
         mcp.run()
@@ -1,117 +1,154 @@
 import os
-import httpx
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 
+from amadeus import BASE_URL, amadeus_request
+from bulkhead import bulkhead, bulkhead_stats
+from cache import PersistentCache, TTLCache
+from deadline import gather_within_deadline
+from scheduler import scheduler
+from tracing import enable_tracing
+from warmup import warmup_lifespan, warmup_status
+
 load_dotenv()
 
-BASE_V1 = "https://test.api.amadeus.com/v1"
-BASE_V2 = "https://test.api.amadeus.com/v2"
-BASE_V3 = "https://test.api.amadeus.com/v3"
-
-mcp: FastMCP = FastMCP("Amadeus Hotels MCP")
-
-# -----------------------
-# AUTH
-# -----------------------
-async def get_token():
-    async with httpx.AsyncClient() as client:
-        r = await client.post(
-            "https://test.api.amadeus.com/v1/security/oauth2/token",
-            data={
-                "grant_type": "client_credentials",
-                "client_id": os.getenv("AMADEUS_CLIENT_ID"),
-                "client_secret": os.getenv("AMADEUS_CLIENT_SECRET"),
-            },
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-        )
-        return r.json()["access_token"]
+BASE_V1 = f"{BASE_URL}/v1"
+BASE_V2 = f"{BASE_URL}/v2"
+BASE_V3 = f"{BASE_URL}/v3"
+
+mcp: FastMCP = FastMCP("Amadeus Hotels MCP", lifespan=warmup_lifespan())
+enable_tracing(mcp)
+
+# =======================
+# PER-HOTEL CACHING
+# =======================
+# Hotel content and sentiments rarely change
+HOTEL_CACHE_TTL = 24 * 60 * 60
+
+# Kept conservative so one request never trips the endpoint's ID limit
+HOTEL_CONTENT_IDS_PER_CALL = 20
+HOTEL_SENTIMENT_IDS_PER_CALL = 3
+
+_hotel_content_cache = TTLCache(ttl=HOTEL_CACHE_TTL, max_entries=10000)
+_hotel_sentiment_cache = TTLCache(ttl=HOTEL_CACHE_TTL, max_entries=10000)
+
+
+async def _fetch_by_hotel_ids(url: str, hotel_ids: str, cache: TTLCache, ids_per_call: int) -> dict:
+    """
+    Serve cached hotels, fetch the rest in concurrent chunks and
+    return all records in input order.
+    """
+    ids = list(dict.fromkeys(i.strip() for i in hotel_ids.split(",") if i.strip()))
+    records = {}
+    missing = []
+    for hotel_id in ids:
+        cached = cache.get(hotel_id)
+        if cached is not None:
+            records[hotel_id] = cached
+        else:
+            missing.append(hotel_id)
+
+    chunks = [missing[i:i + ids_per_call] for i in range(0, len(missing), ids_per_call)]
+    def timed_out(index: int) -> dict:
+        return {"errors": [{"detail": "Deadline exceeded", "hotelIds": chunks[index]}]}
+
+    responses = await gather_within_deadline(
+        (
+            amadeus_request("GET", url, params={"hotelIds": ",".join(chunk)}, raise_for_status=False)
+            for chunk in chunks
+        ),
+        timed_out,
+    )
+
+    errors = []
+    warnings = []
+    for response in responses:
+        errors.extend(response.get("errors", []))
+        warnings.extend(response.get("warnings", []))
+        for record in response.get("data", []):
+            hotel_id = record.get("hotelId")
+            if hotel_id:
+                cache.set(hotel_id, record)
+                records[hotel_id] = record
+
+    result = {
+        "data": [records[hotel_id] for hotel_id in ids if hotel_id in records],
+        "meta": {"count": len(records), "cached": len(ids) - len(missing), "fetched": len(missing)},
+    }
+    if errors:
+        result["errors"] = errors
+    if warnings:
+        result["warnings"] = warnings
+    return result
 
 
 # =======================
 # HOTEL LIST APIs
 # =======================
 async def hotels_by_city(city_code: str):
-    token = await get_token()
-    headers = {"Authorization": f"Bearer {token}"}
     params = {"cityCode": city_code}
 
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            f"{BASE_V1}/reference-data/locations/hotels/by-city",
-            headers=headers,
-            params=params,
-        )
-        return r.json()
+    return await amadeus_request(
+        "GET",
+        f"{BASE_V1}/reference-data/locations/hotels/by-city",
+        params=params,
+        raise_for_status=False,
+    )
 
 
 async def hotels_by_geocode(latitude: float, longitude: float):
-    token = await get_token()
-    headers = {"Authorization": f"Bearer {token}"}
     params = {"latitude": latitude, "longitude": longitude}
 
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            f"{BASE_V1}/reference-data/locations/hotels/by-geocode",
-            headers=headers,
-            params=params,
-        )
-        return r.json()
+    return await amadeus_request(
+        "GET",
+        f"{BASE_V1}/reference-data/locations/hotels/by-geocode",
+        params=params,
+        raise_for_status=False,
+    )
 
 
 async def hotels_by_ids(hotel_ids: str):
-    token = await get_token()
-    headers = {"Authorization": f"Bearer {token}"}
-    params = {"hotelIds": hotel_ids}
-
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            f"{BASE_V1}/reference-data/locations/hotels/by-hotels",
-            headers=headers,
-            params=params,
-        )
-        return r.json()
+    """
+    Hotel content for comma-separated hotel IDs.
+    Hotels seen recently are served from cache.
+    """
+    return await _fetch_by_hotel_ids(
+        f"{BASE_V1}/reference-data/locations/hotels/by-hotels",
+        hotel_ids,
+        _hotel_content_cache,
+        HOTEL_CONTENT_IDS_PER_CALL,
+    )
 
 
 # =======================
 # HOTEL SEARCH APIs
 # =======================
 async def hotel_offers(city_code: str):
-    token = await get_token()
-    headers = {"Authorization": f"Bearer {token}"}
     params = {"cityCode": city_code}
 
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            f"{BASE_V3}/shopping/hotel-offers",
-            headers=headers,
-            params=params,
-        )
-        return r.json()
+    return await amadeus_request(
+        "GET",
+        f"{BASE_V3}/shopping/hotel-offers",
+        params=params,
+        raise_for_status=False,
+    )
 
 
 async def hotel_offer_pricing(offer_id: str):
-    token = await get_token()
-    headers = {"Authorization": f"Bearer {token}"}
-
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            f"{BASE_V3}/shopping/hotel-offers/{offer_id}",
-            headers=headers,
-        )
-        return r.json()
+    return await amadeus_request(
+        "GET",
+        f"{BASE_V3}/shopping/hotel-offers/{offer_id}",
+        raise_for_status=False,
+    )
 
 
 # =======================
 # HOTEL BOOKING
 # =======================
 async def book_hotel(offer_id: str, guest_first_name: str, guest_last_name: str):
-    token = await get_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
-
     body = {
         "data": {
             "offerId": offer_id,
@@ -126,81 +163,214 @@ async def book_hotel(offer_id: str, guest_first_name: str, guest_last_name: str)
         }
     }
 
-    async with httpx.AsyncClient() as client:
-        r = await client.post(
-            f"{BASE_V2}/booking/hotel-orders",
-            headers=headers,
-            json=body,
-        )
-        return r.json()
+    return await amadeus_request(
+        "POST",
+        f"{BASE_V2}/booking/hotel-orders",
+        json=body,
+        raise_for_status=False,
+    )
 
 
 # =======================
 # HOTEL RATINGS
 # =======================
 async def hotel_ratings(hotel_ids: str):
-    token = await get_token()
-    headers = {"Authorization": f"Bearer {token}"}
-    params = {"hotelIds": hotel_ids}
-
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            f"{BASE_V2}/e-reputation/hotel-sentiments",
-            headers=headers,
-            params=params,
-        )
-        return r.json()
+    """
+    Sentiment ratings for comma-separated hotel IDs.
+    Hotels seen recently are served from cache.
+    """
+    return await _fetch_by_hotel_ids(
+        f"{BASE_V2}/e-reputation/hotel-sentiments",
+        hotel_ids,
+        _hotel_sentiment_cache,
+        HOTEL_SENTIMENT_IDS_PER_CALL,
+    )
 
 
 # =======================
 # HOTEL NAME AUTOCOMPLETE
 # =======================
 async def hotel_name_autocomplete(keyword: str):
-    token = await get_token()
-    headers = {"Authorization": f"Bearer {token}"}
     params = {"keyword": keyword}
 
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            f"{BASE_V1}/reference-data/locations/hotel",
-            headers=headers,
-            params=params,
-        )
-        return r.json()
+    return await amadeus_request(
+        "GET",
+        f"{BASE_V1}/reference-data/locations/hotel",
+        params=params,
+        raise_for_status=False,
+    )
 
 # =======================
 # CARS & TRANSFERS APIs
 # =======================
 
+TRANSFER_TYPES = ["PRIVATE", "SHARED", "TAXI", "HOURLY"]
+TRANSFER_CACHE_TTL = 5 * 60
+
+# Cache key precision: ~100 m and 15-minute pickup slots
+TRANSFER_GEO_DECIMALS = 3
+TRANSFER_SLOT_MINUTES = 15
+
+_transfer_cache = TTLCache(ttl=TRANSFER_CACHE_TTL)
+
+
+def _transfer_body(
+    start_latitude: float,
+    start_longitude: float,
+    end_latitude: float,
+    end_longitude: float,
+    start_date_time: str,
+    passengers: int,
+    transfer_type: str,
+    hourly_duration: str
+) -> dict:
+    body = {
+        "startGeoCode": f"{start_latitude},{start_longitude}",
+        "endGeoCode": f"{end_latitude},{end_longitude}",
+        "transferType": transfer_type,
+        "startDateTime": start_date_time,
+        "passengers": passengers,
+    }
+    if transfer_type == "HOURLY":
+        body["duration"] = hourly_duration
+    return body
+
+
 # Transfer Search (Get transfer offers)
 async def transfer_search(
     start_latitude: float,
     start_longitude: float,
     end_latitude: float,
-    end_longitude: float
+    end_longitude: float,
+    start_date_time: str,
+    passengers: int = 1,
+    transfer_type: str = "PRIVATE"
 ):
     """
     Search transfer offers between two locations
+    start_date_time: local pickup time, e.g. "2026-11-10T10:30:00"
     """
-    token = await get_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
+    body = _transfer_body(
+        start_latitude, start_longitude, end_latitude, end_longitude,
+        start_date_time, passengers, transfer_type, "PT2H"
+    )
+
+    return await amadeus_request(
+        "POST",
+        f"{BASE_V1}/shopping/transfer-offers",
+        json=body,
+        raise_for_status=False,
+    )
+
+
+def _transfer_slot(start_date_time: str) -> str:
+    pickup = datetime.fromisoformat(start_date_time)
+    pickup = pickup.replace(
+        minute=pickup.minute - pickup.minute % TRANSFER_SLOT_MINUTES, second=0, microsecond=0
+    )
+    return pickup.isoformat()
+
+
+def _transfer_minutes(offer: dict) -> int | None:
+    start = offer.get("start", {}).get("dateTime")
+    end = offer.get("end", {}).get("dateTime")
+    if not start or not end:
+        return None
+    return int((datetime.fromisoformat(end) - datetime.fromisoformat(start)).total_seconds() // 60)
+
+
+def _normalize_transfer(offer: dict) -> dict:
+    quotation = offer.get("quotation", {})
+    vehicle = offer.get("vehicle", {})
+    try:
+        price = float(quotation.get("monetaryAmount"))
+    except (TypeError, ValueError):
+        price = None
+
+    return {
+        "offer_id": offer.get("id"),
+        "transfer_type": offer.get("transferType"),
+        "vehicle": vehicle.get("description"),
+        "seats": (vehicle.get("seats") or [{}])[0].get("count"),
+        "provider": offer.get("serviceProvider", {}).get("name"),
+        "price": price,
+        "currency": quotation.get("currencyCode"),
+        "duration_minutes": _transfer_minutes(offer),
     }
 
-    body = {
-        "startLocationCode": f"{start_latitude},{start_longitude}",
-        "endLocationCode": f"{end_latitude},{end_longitude}",
-        "transferType": "PRIVATE"
-    }
 
-    async with httpx.AsyncClient() as client:
-        r = await client.post(
+# Transfer Comparison (all types at once)
+async def transfer_search_compare(
+    start_latitude: float,
+    start_longitude: float,
+    end_latitude: float,
+    end_longitude: float,
+    start_date_time: str,
+    passengers: int = 1,
+    transfer_types: list[str] | None = None,
+    rank_by: str = "price",
+    max_results: int = 10,
+    hourly_duration: str = "PT2H"
+):
+    """
+    Compare private, shared, taxi and hourly transfers in one call.
+    All types are searched concurrently and merged into one list
+    ranked by price or duration.
+    start_date_time: local pickup time, e.g. "2026-11-10T10:30:00"
+    """
+    transfer_types = transfer_types or TRANSFER_TYPES
+    slot = _transfer_slot(start_date_time)
+    route = tuple(
+        round(value, TRANSFER_GEO_DECIMALS)
+        for value in (start_latitude, start_longitude, end_latitude, end_longitude)
+    )
+
+    async def search(transfer_type: str):
+        key = (route, slot, passengers, transfer_type, hourly_duration if transfer_type == "HOURLY" else None)
+        cached = _transfer_cache.get(key)
+        if cached is not None:
+            return transfer_type, cached
+
+        data = await amadeus_request(
+            "POST",
             f"{BASE_V1}/shopping/transfer-offers",
-            headers=headers,
-            json=body
+            json=_transfer_body(
+                start_latitude, start_longitude, end_latitude, end_longitude,
+                start_date_time, passengers, transfer_type, hourly_duration
+            ),
+            raise_for_status=False,
         )
-        return r.json()
+        if "errors" not in data:
+            _transfer_cache.set(key, data)
+        return transfer_type, data
+
+    offers = []
+    errors = {}
+    def timed_out(index: int):
+        return transfer_types[index], {"errors": [{"detail": "Deadline exceeded"}]}
+
+    for transfer_type, data in await gather_within_deadline((search(t) for t in transfer_types), timed_out):
+        if "errors" in data:
+            errors[transfer_type] = data["errors"]
+            continue
+        offers.extend(_normalize_transfer(offer) for offer in data.get("data", []))
+
+    def by_price(offer):
+        return offer["price"] if offer["price"] is not None else float("inf")
+
+    def by_duration(offer):
+        return offer["duration_minutes"] if offer["duration_minutes"] is not None else float("inf")
+
+    if rank_by == "duration":
+        offers.sort(key=lambda o: (by_duration(o), by_price(o)))
+    else:
+        offers.sort(key=lambda o: (by_price(o), by_duration(o)))
+
+    return {
+        "offers": offers[:max_results],
+        "total_offers": len(offers),
+        "errors": errors,
+    }
 
 
 # Transfer Booking (Create transfer order)
@@ -213,12 +383,6 @@ async def transfer_booking(
     """
     Book a transfer using an offerId
     """
-    token = await get_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-
     body = {
         "data": {
             "offerId": offer_id,
@@ -234,13 +398,12 @@ async def transfer_booking(
         }
     }
 
-    async with httpx.AsyncClient() as client:
-        r = await client.post(
-            f"{BASE_V1}/ordering/transfer-orders",
-            headers=headers,
-            json=body
-        )
-        return r.json()
+    return await amadeus_request(
+        "POST",
+        f"{BASE_V1}/ordering/transfer-orders",
+        json=body,
+        raise_for_status=False,
+    )
 
 
 # Transfer Management (Cancel transfer)
@@ -251,42 +414,70 @@ async def cancel_transfer(
     """
     Cancel a transfer in an existing order
     """
-    token = await get_token()
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
-    }
-
-    async with httpx.AsyncClient() as client:
-        r = await client.post(
-            f"{BASE_V1}/ordering/transfer-orders/{order_id}/transfers/{transfer_id}/cancellation",
-            headers=headers
-        )
-        return r.json()
+    return await amadeus_request(
+        "POST",
+        f"{BASE_V1}/ordering/transfer-orders/{order_id}/transfers/{transfer_id}/cancellation",
+        raise_for_status=False,
+    )
 
 # =======================
 # MARKET INSIGHTS APIs
 # =======================
 
+AIR_TRAFFIC_PATHS = {
+    "traveled": "travel/analytics/air-traffic/traveled",
+    "booked": "travel/analytics/air-traffic/booked",
+}
+AIR_TRAFFIC_CONCURRENCY = 4
+
+# Closed months (and years) never change, so they are cached with no expiry
+market_insights_cache = PersistentCache(
+    os.getenv(
+        "MARKET_INSIGHTS_CACHE_DB",
+        str(Path(__file__).resolve().parent / "market_insights.db"),
+    ),
+    max_age=None,
+)
+
+
+def _is_closed_period(period: str) -> bool:
+    # period is a month (YYYY-MM) or a year (YYYY)
+    current = datetime.now(timezone.utc).strftime("%Y" if len(period) == 4 else "%Y-%m")
+    return period < current
+
+
+async def _market_insight(key: str, period: str, path: str, params: dict):
+    closed = _is_closed_period(period)
+    if closed:
+        cached = await asyncio.to_thread(market_insights_cache.get, key)
+        if cached is not None:
+            return cached
+
+    data = await amadeus_request("GET", f"{BASE_V1}/{path}", params=params, raise_for_status=False)
+
+    if closed and "errors" not in data:
+        await asyncio.to_thread(market_insights_cache.set, key, data)
+    return data
+
+
+async def _air_traffic(kind: str, origin_city_code: str, period: str):
+    return await _market_insight(
+        f"air-traffic:{kind}:{origin_city_code}:{period}",
+        period,
+        AIR_TRAFFIC_PATHS[kind],
+        {
+            "originCityCode": origin_city_code,
+            "period": period
+        },
+    )
+
+
 # Flight Most Traveled Destinations
 async def flight_most_traveled_destinations(origin_city_code: str, period: str = "2023-01"):
     """
     Returns the most traveled destinations from a city
     """
-    token = await get_token()
-    headers = {"Authorization": f"Bearer {token}"}
-    params = {
-        "originCityCode": origin_city_code,
-        "period": period
-    }
-
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            f"{BASE_V1}/travel/analytics/air-traffic/traveled",
-            headers=headers,
-            params=params
-        )
-        return r.json()
+    return await _air_traffic("traveled", origin_city_code, period)
 
 
 # Flight Most Booked Destinations
@@ -294,66 +485,140 @@ async def flight_most_booked_destinations(origin_city_code: str, period: str = "
     """
     Returns the most booked destinations from a city
     """
-    token = await get_token()
-    headers = {"Authorization": f"Bearer {token}"}
-    params = {
-        "originCityCode": origin_city_code,
-        "period": period
-    }
+    return await _air_traffic("booked", origin_city_code, period)
 
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            f"{BASE_V1}/travel/analytics/air-traffic/booked",
-            headers=headers,
-            params=params
-        )
-        return r.json()
 
+def _month_range(start_period: str, end_period: str) -> list[str]:
+    year, month = map(int, start_period.split("-"))
+    end_year, end_month = map(int, end_period.split("-"))
 
-# Flight Busiest Traveling Period
-async def flight_busiest_traveling_period(origin_city_code: str, destination_city_code: str):
+    months = []
+    while (year, month) <= (end_year, end_month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+# Air Traffic Trend (multi-period)
+async def flight_traffic_trend(
+    origin_city_code: str,
+    start_period: str,
+    end_period: str,
+    kind: str = "traveled",
+    max_destinations: int = 10
+):
     """
-    Returns busiest traveling period between two cities
+    Most traveled or booked destinations from a city across a range
+    of months (YYYY-MM), merged into one table of travelers scores.
+    kind: "traveled" or "booked"
     """
-    token = await get_token()
-    headers = {"Authorization": f"Bearer {token}"}
-    params = {
-        "originCityCode": origin_city_code,
-        "destinationCityCode": destination_city_code
+    if kind not in AIR_TRAFFIC_PATHS:
+        return {"error": f"kind must be one of {sorted(AIR_TRAFFIC_PATHS)}"}
+
+    periods = _month_range(start_period, end_period)
+    semaphore = asyncio.Semaphore(AIR_TRAFFIC_CONCURRENCY)
+
+    async def fetch(period: str):
+        async with semaphore:
+            return await _air_traffic(kind, origin_city_code, period)
+
+    def timed_out(index: int) -> dict:
+        return {"errors": [{"detail": "Deadline exceeded"}]}
+
+    responses = await gather_within_deadline((fetch(period) for period in periods), timed_out)
+
+    scores: dict[str, dict[str, float]] = {}
+    errors = {}
+    for period, response in zip(periods, responses):
+        if "errors" in response:
+            errors[period] = response["errors"]
+            continue
+        for item in response.get("data", []):
+            score = item.get("analytics", {}).get("travelers", {}).get("score")
+            scores.setdefault(item.get("destination"), {})[period] = score
+
+    ranked = sorted(scores, key=lambda dest: -sum(v or 0 for v in scores[dest].values()))
+    return {
+        "origin": origin_city_code,
+        "kind": kind,
+        "columns": ["destination", *periods],
+        "rows": [
+            [dest, *(scores[dest].get(period) for period in periods)]
+            for dest in ranked[:max_destinations]
+        ],
+        "errors": errors,
     }
 
-    async with httpx.AsyncClient() as client:
-        r = await client.get(
-            f"{BASE_V1}/travel/analytics/air-traffic/busiest-period",
-            headers=headers,
-            params=params
-        )
-        return r.json()
+
+# Flight Busiest Traveling Period
+async def flight_busiest_traveling_period(
+    origin_city_code: str,
+    destination_city_code: str,
+    period: str = "2023"
+):
+    """
+    Returns busiest traveling period between two cities
+    period: year (YYYY); closed years are cached permanently
+    """
+    return await _market_insight(
+        f"busiest-period:{origin_city_code}:{destination_city_code}:{period}",
+        period,
+        "travel/analytics/air-traffic/busiest-period",
+        {
+            "originCityCode": origin_city_code,
+            "destinationCityCode": destination_city_code,
+            "period": period
+        },
+    )
 
 
 # =======================
 # REGISTER ALL TOOLS
 # =======================
-mcp.tool(hotels_by_city)
-mcp.tool(hotels_by_geocode)
-mcp.tool(hotels_by_ids)
+mcp.tool(bulkhead("interactive")(hotels_by_city))
+mcp.tool(bulkhead("interactive")(hotels_by_geocode))
+mcp.tool(bulkhead("interactive")(hotels_by_ids))
+
+mcp.tool(bulkhead("search")(hotel_offers))
+mcp.tool(bulkhead("booking")(hotel_offer_pricing))
 
-mcp.tool(hotel_offers)
-mcp.tool(hotel_offer_pricing)
+mcp.tool(bulkhead("booking")(book_hotel))
 
-mcp.tool(book_hotel)
+mcp.tool(bulkhead("interactive")(hotel_ratings))
 
-mcp.tool(hotel_ratings)
+mcp.tool(bulkhead("interactive")(hotel_name_autocomplete))
 
-mcp.tool(hotel_name_autocomplete)
+mcp.tool(bulkhead("search")(transfer_search))
+mcp.tool(bulkhead("search")(transfer_search_compare))
+mcp.tool(bulkhead("booking")(transfer_booking))
+mcp.tool(bulkhead("booking")(cancel_transfer))
+
+mcp.tool(bulkhead("interactive")(flight_most_traveled_destinations))
+mcp.tool(bulkhead("interactive")(flight_most_booked_destinations))
+mcp.tool(bulkhead("bulk")(flight_traffic_trend))
+mcp.tool(bulkhead("interactive")(flight_busiest_traveling_period))
+
+
+async def concurrency_stats():
+    """
+    Per tool-group concurrency limits, queue depth and wait times,
+    plus the upstream request scheduler's state.
+    """
+    return {"tool_groups": bulkhead_stats(), "upstream": scheduler.stats()}
+
+
+mcp.tool(concurrency_stats)
+
+
+async def server_readiness():
+    """
+    Startup warm-up progress: whether the token, pooled connection and
+    preloaded reference data are ready, with per-step timings.
+    """
+    return warmup_status()
 
-mcp.tool(transfer_search)
-mcp.tool(transfer_booking)
-mcp.tool(cancel_transfer)
 
-mcp.tool(flight_most_traveled_destinations)
-mcp.tool(flight_most_booked_destinations)
-mcp.tool(flight_busiest_traveling_period)
+mcp.tool(server_readiness)
 
 if __name__ == "__main__":
     mcp.run()
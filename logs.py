@@ -0,0 +1,122 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+from typing import Optional
+
+# -------------------------------------------------
+# Config
+# Records go to stderr (never stdout: the stdio transport owns it)
+# or to LOG_FILE, written by a background thread.
+# -------------------------------------------------
+LOG_FILE = os.getenv("LOG_FILE")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Share of successful upstream calls that are logged
+LOG_SUCCESS_SAMPLE_RATE = float(os.getenv("LOG_SUCCESS_SAMPLE_RATE", "0.05"))
+
+# Error bodies are cut to this many characters
+LOG_ERROR_BODY_CHARS = 1000
+
+# Records beyond this many waiting are dropped rather than block the loop
+LOG_QUEUE_SIZE = 10000
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger whose records are formatted and written off the event loop.
+    """
+    global _listener
+    root = logging.getLogger("amadeus_mcp")
+    if _listener is None:
+        if LOG_FILE:
+            target = logging.FileHandler(LOG_FILE, encoding="utf-8")
+        else:
+            target = logging.StreamHandler(sys.stderr)
+        target.setFormatter(JsonFormatter())
+
+        records: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+        root.addHandler(_DroppingQueueHandler(records))
+        root.setLevel(LOG_LEVEL)
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(records, target, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    return root.getChild(name)
+
+
+_upstream_log = get_logger("upstream")
+
+
+def log_upstream(
+    method: str,
+    url: str,
+    started: float,
+    status: Optional[int] = None,
+    size: int = 0,
+    error_body: Optional[str] = None,
+    error: Optional[BaseException] = None
+) -> None:
+    """
+    One record per upstream call. Failures are always logged;
+    successes only for a LOG_SUCCESS_SAMPLE_RATE sample.
+    started is a time.perf_counter() value.
+    """
+    failed = error is not None or status is None or status >= 400
+    if not failed and random.random() >= LOG_SUCCESS_SAMPLE_RATE:
+        return
+
+    fields = {
+        "method": method,
+        "endpoint": url.split("?", 1)[0],
+        "status": status,
+        "latency_ms": round(1000 * (time.perf_counter() - started), 1),
+        "bytes": size,
+    }
+    if error is not None:
+        fields["error"] = f"{type(error).__name__}: {error}"
+    if error_body:
+        fields["error_body"] = error_body[:LOG_ERROR_BODY_CHARS]
+    if not failed:
+        fields["sample_rate"] = LOG_SUCCESS_SAMPLE_RATE
+
+    _upstream_log.log(
+        logging.WARNING if failed else logging.INFO,
+        "upstream request failed" if failed else "upstream request",
+        extra={"fields": fields},
+    )
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import sys
+from typing import Iterator, Optional
+
+from offer_ranking import duration_minutes
+
+
+def _code(value: Optional[str]) -> Optional[str]:
+    # Airport, carrier and currency codes repeat across every offer
+    return sys.intern(value) if value else value
+
+
+class Segment:
+    """
+    One flight of an itinerary, reduced to what summaries and
+    matching need. Codes are interned.
+    """
+
+    __slots__ = ("carrier", "number", "origin", "destination", "departure_at", "arrival_at")
+
+    def __init__(self, carrier, number, origin, destination, departure_at, arrival_at):
+        self.carrier = carrier
+        self.number = number
+        self.origin = origin
+        self.destination = destination
+        self.departure_at = departure_at
+        self.arrival_at = arrival_at
+
+    @classmethod
+    def from_json(cls, segment: dict) -> "Segment":
+        departure = segment.get("departure", {})
+        arrival = segment.get("arrival", {})
+        return cls(
+            _code(segment.get("carrierCode")),
+            segment.get("number"),
+            _code(departure.get("iataCode")),
+            _code(arrival.get("iataCode")),
+            departure.get("at"),
+            arrival.get("at"),
+        )
+
+    def __repr__(self) -> str:
+        return f"Segment({self.carrier}{self.number} {self.origin}-{self.destination} {self.departure_at})"
+
+
+class FlightOffer:
+    """
+    Compact flight offer: the fields tools read, plus the upstream
+    offer as compact JSON bytes for pricing and booking, which need
+    the offer exactly as Amadeus returned it.
+    """
+
+    __slots__ = ("id", "grand_total", "currency", "duration_minutes", "itineraries", "carriers", "key", "_raw")
+
+    def __init__(self, offer: dict):
+        price = offer.get("price", {})
+        self.id = offer.get("id")
+        self.grand_total = price.get("grandTotal")
+        self.currency = _code(price.get("currency"))
+        self.itineraries = tuple(
+            tuple(Segment.from_json(seg) for seg in itin.get("segments", []))
+            for itin in offer.get("itineraries", [])
+        )
+        self.duration_minutes = sum(duration_minutes(itin.get("duration")) for itin in offer.get("itineraries", []))
+        self.carriers = frozenset(seg.carrier for seg in self.segments())
+        # Same as offer_key(offer), without walking the dict again
+        self.key = (
+            tuple((seg.carrier, seg.number, seg.departure_at) for seg in self.segments()),
+            self.grand_total,
+        )
+        self._raw = json.dumps(offer, separators=(",", ":")).encode()
+
+    def to_json(self) -> dict:
+        return json.loads(self._raw)
+
+    def segments(self) -> Iterator[Segment]:
+        for itin in self.itineraries:
+            yield from itin
+
+    @property
+    def price(self) -> float:
+        return float(self.grand_total)
+
+    @property
+    def stops(self) -> int:
+        return sum(max(len(itin) - 1, 0) for itin in self.itineraries)
+
+    def __repr__(self) -> str:
+        return f"FlightOffer({self.id}, {self.grand_total} {self.currency}, {len(self.itineraries)} itineraries)"
+
+
+def offer_key(offer: dict) -> tuple:
+    """
+    Identify an offer by its flights and price. Offer IDs restart at 1
+    on every search, so they cannot be used across searches.
+    """
+    return (
+        tuple(
+            (seg.get("carrierCode"), seg.get("number"), seg.get("departure", {}).get("at"))
+            for itin in offer.get("itineraries", [])
+            for seg in itin.get("segments", [])
+        ),
+        offer.get("price", {}).get("grandTotal"),
+    )
+
+
+def offer_ref(key: tuple) -> str:
+    """
+    Short ID for an offer_key. Unlike the upstream offer ID it does not
+    depend on which search returned the offer, so tools can take it later.
+    """
+    return hashlib.blake2s(repr(key).encode(), digest_size=6).hexdigest()
@@ -0,0 +1,176 @@
+import heapq
+import re
+
+import numpy as np
+
+# Lower score ranks first; each term is scaled to 0..1 across the offers
+DEFAULT_WEIGHTS = {
+    "price": 1.0,
+    "duration": 0.5,
+    "stops": 0.3,
+    "departure": 0.0,
+    "arrival": 0.0,
+}
+
+# Offers flying the same airports whose departure and arrival are
+# within this many minutes of each other count as the same itinerary
+# (codeshares, or one flight sold in several fare families)
+DEDUP_TOLERANCE_MINUTES = 30
+
+_ISO_DURATION = re.compile(r"P(?:(\d+)D)?T?(?:(\d+)H)?(?:(\d+)M)?")
+
+
+def duration_minutes(duration: str | None) -> int:
+    match = _ISO_DURATION.match(duration or "")
+    if not match:
+        return 0
+    days, hours, minutes = (int(part or 0) for part in match.groups())
+    return days * 1440 + hours * 60 + minutes
+
+
+def load_offers(offers: list[dict]) -> dict:
+    """
+    Flatten flight offers into columns: price, total duration (minutes),
+    stops, first departure and last arrival (datetime64[m], local time),
+    carriers and the sequence of airports flown.
+    """
+    price, duration, stops, departure, arrival, carriers, paths = [], [], [], [], [], [], []
+    for offer in offers:
+        itineraries = offer.get("itineraries", [])
+        segments = [seg for itin in itineraries for seg in itin.get("segments", [])]
+        try:
+            price.append(float(offer["price"]["grandTotal"]))
+        except (KeyError, TypeError, ValueError):
+            price.append(np.nan)
+
+        duration.append(sum(duration_minutes(itin.get("duration")) for itin in itineraries))
+        stops.append(sum(max(len(itin.get("segments", [])) - 1, 0) for itin in itineraries))
+        departure.append(segments[0].get("departure", {}).get("at", "NaT") if segments else "NaT")
+        arrival.append(segments[-1].get("arrival", {}).get("at", "NaT") if segments else "NaT")
+        carriers.append(",".join(sorted({seg.get("carrierCode", "") for seg in segments})))
+        paths.append("|".join(
+            f"{seg.get('departure', {}).get('iataCode')}-{seg.get('arrival', {}).get('iataCode')}"
+            for seg in segments
+        ))
+
+    return {
+        "price": np.array(price, dtype=np.float64),
+        "duration": np.array(duration, dtype=np.int64),
+        "stops": np.array(stops, dtype=np.int64),
+        "departure": np.array(departure, dtype="datetime64[m]"),
+        "arrival": np.array(arrival, dtype="datetime64[m]"),
+        "carriers": np.array(carriers, dtype=object),
+        "path": np.array(paths, dtype=object),
+    }
+
+
+def _scaled(values: np.ndarray) -> np.ndarray:
+    """
+    Min-max scale to 0..1; missing values rank last.
+    """
+    values = values.astype(np.float64)
+    finite = np.isfinite(values)
+    if not finite.any():
+        return np.zeros(values.size)
+    low, high = values[finite].min(), values[finite].max()
+    span = high - low
+    scaled = (values - low) / span if span else np.zeros(values.size)
+    return np.where(finite, scaled, 1.0)
+
+
+def _minute_of_day(times: np.ndarray) -> np.ndarray:
+    minutes = (times - times.astype("datetime64[D]")).astype(np.float64)
+    return np.where(np.isnat(times), np.nan, minutes)
+
+
+def score_offers(columns: dict, weights: dict | None = None) -> np.ndarray:
+    """
+    Weighted score per offer, lower is better. "departure" favours
+    earlier departure times of day, "arrival" earlier arrivals; use a
+    negative weight to prefer later ones.
+    """
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    terms = {
+        "price": columns["price"],
+        "duration": columns["duration"],
+        "stops": columns["stops"],
+        "departure": _minute_of_day(columns["departure"]),
+        "arrival": _minute_of_day(columns["arrival"]),
+    }
+
+    score = np.zeros(columns["price"].size)
+    for name, weight in weights.items():
+        if weight and name in terms:
+            score += weight * _scaled(terms[name])
+    return score
+
+
+def _dedup(columns: dict, score: np.ndarray, tolerance_minutes: int) -> np.ndarray:
+    """
+    Index of the best-scoring offer among each group of near-duplicates.
+    Within a path, offers sorted by departure join the previous offer's
+    group when both departure and arrival are within tolerance of it.
+    """
+    _, path = np.unique(columns["path"].astype(str), return_inverse=True)
+    departure = _minutes(columns["departure"])
+    arrival = _minutes(columns["arrival"])
+
+    order = np.lexsort((departure, path))
+    same = np.zeros(order.size, dtype=bool)
+    same[1:] = (
+        (path[order][1:] == path[order][:-1])
+        & (np.diff(departure[order]) <= tolerance_minutes)
+        & (np.abs(np.diff(arrival[order])) <= tolerance_minutes)
+    )
+    group = np.empty(order.size, dtype=np.int64)
+    group[order] = np.cumsum(~same)
+
+    best = np.lexsort((score, group))
+    first = np.ones(best.size, dtype=bool)
+    first[1:] = group[best][1:] != group[best][:-1]
+    return best[first]
+
+
+def _minutes(times: np.ndarray) -> np.ndarray:
+    # Missing times become NaN, which never counts as within tolerance
+    return np.where(np.isnat(times), np.nan, times.astype(np.int64).astype(np.float64))
+
+
+def rank_offers(
+    offers: list[dict],
+    k: int = 10,
+    weights: dict | None = None,
+    dedup: bool = True,
+    tolerance_minutes: int = DEDUP_TOLERANCE_MINUTES
+) -> dict:
+    """
+    Top k offers by weighted score, near-duplicates removed.
+    Each ranked entry carries the offer's index in the input list.
+    """
+    if not offers:
+        return {"considered": 0, "duplicates_removed": 0, "ranked": []}
+
+    columns = load_offers(offers)
+    score = score_offers(columns, weights)
+    candidates = _dedup(columns, score, tolerance_minutes) if dedup else np.arange(score.size)
+
+    top = heapq.nsmallest(k, zip(score[candidates].tolist(), candidates.tolist()))
+
+    ranked = [
+        {
+            "index": i,
+            "score": round(s, 4),
+            "price": None if np.isnan(columns["price"][i]) else float(columns["price"][i]),
+            "duration_minutes": int(columns["duration"][i]),
+            "stops": int(columns["stops"][i]),
+            "departure": None if np.isnat(columns["departure"][i]) else str(columns["departure"][i]),
+            "arrival": None if np.isnat(columns["arrival"][i]) else str(columns["arrival"][i]),
+            "carriers": columns["carriers"][i].split(",") if columns["carriers"][i] else [],
+        }
+        for s, i in top
+    ]
+    return {
+        "considered": int(score.size),
+        "duplicates_removed": int(score.size - candidates.size),
+        "ranked": ranked,
+    }
@@ -0,0 +1,192 @@
+import asyncio
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from batch_writer import BatchWriter
+
+# -------------------------------------------------
+# Config
+# -------------------------------------------------
+PRICE_HISTORY_DB = os.getenv(
+    "PRICE_HISTORY_DB",
+    str(Path(__file__).resolve().parent / "price_history.db"),
+)
+
+# Pending rows are written after this delay, or as soon as the batch is full
+FLUSH_INTERVAL = 2.0
+FLUSH_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    origin TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    departure_date TEXT,
+    return_date TEXT,
+    currency TEXT,
+    price REAL NOT NULL,
+    source TEXT NOT NULL,
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_prices_route
+    ON prices (origin, destination, currency, departure_date, observed_at);
+"""
+
+DAY = 24 * 60 * 60
+
+
+class PriceHistoryStore:
+    """
+    Embedded SQLite log of every observed fare.
+    Inserts are buffered and written in batches on a worker thread.
+    """
+
+    def __init__(self, path: str = PRICE_HISTORY_DB):
+        self.path = path
+        self._ready = False
+        self._batches = BatchWriter(self._insert, FLUSH_INTERVAL, FLUSH_BATCH_SIZE)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._ready = True
+        return conn
+
+    # -----------------------
+    # Writes
+    # -----------------------
+    def record(self, source: str, origin: str, rows: list[dict]) -> None:
+        """
+        Queue normalized tool rows (destination, departure_date,
+        return_date, price, currency) for insertion.
+        """
+        now = time.time()
+        pending = []
+        for row in rows:
+            try:
+                price = float(row["price"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            pending.append((
+                origin,
+                row.get("destination"),
+                row.get("departure_date"),
+                row.get("return_date"),
+                row.get("currency"),
+                price,
+                source,
+                now,
+            ))
+
+        self._batches.extend(pending)
+
+    async def flush(self) -> None:
+        await self._batches.flush()
+
+    def _insert(self, batch: list[tuple]) -> None:
+        with self._connect() as conn:
+            conn.executemany("INSERT INTO prices VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+        conn.close()
+
+    # -----------------------
+    # Queries
+    # -----------------------
+    async def _query(self, sql: str, params: tuple) -> list[tuple]:
+        await self.flush()
+
+        def run():
+            conn = self._connect()
+            try:
+                return conn.execute(sql, params).fetchall()
+            finally:
+                conn.close()
+
+        return await asyncio.to_thread(run)
+
+    async def cheapest(self, origin: str, destination: str, currency: str, max_age_days: float = 7) -> Optional[dict]:
+        rows = await self._query(
+            """
+            SELECT price, departure_date, return_date, source, observed_at
+            FROM prices
+            WHERE origin = ? AND destination = ? AND currency = ? AND observed_at >= ?
+            ORDER BY price, observed_at DESC
+            LIMIT 1
+            """,
+            (origin, destination, currency, time.time() - max_age_days * DAY),
+        )
+        if not rows:
+            return None
+
+        price, departure_date, return_date, source, observed_at = rows[0]
+        return {
+            "price": price,
+            "currency": currency,
+            "departure_date": departure_date,
+            "return_date": return_date,
+            "source": source,
+            "age_hours": round((time.time() - observed_at) / 3600, 1),
+        }
+
+    async def trend(
+        self,
+        origin: str,
+        destination: str,
+        currency: str,
+        departure_date: Optional[str] = None,
+        days: int = 30
+    ) -> dict:
+        sql = """
+            SELECT date(observed_at, 'unixepoch') AS day, MIN(price), AVG(price), COUNT(*)
+            FROM prices
+            WHERE origin = ? AND destination = ? AND currency = ? AND observed_at >= ?
+        """
+        params: tuple = (origin, destination, currency, time.time() - days * DAY)
+        if departure_date:
+            sql += " AND departure_date = ?"
+            params += (departure_date,)
+        sql += " GROUP BY day ORDER BY day"
+
+        series = [
+            {"day": day, "min": low, "avg": round(avg, 2), "observations": count}
+            for day, low, avg, count in await self._query(sql, params)
+        ]
+
+        change = None
+        if len(series) >= 2:
+            change = round(series[-1]["min"] - series[0]["min"], 2)
+
+        return {
+            "origin": origin,
+            "destination": destination,
+            "currency": currency,
+            "departure_date": departure_date,
+            "series": series,
+            "min_price_change": change,
+        }
+
+    async def staleness(self, origin: str, destination: Optional[str] = None) -> list[dict]:
+        sql = """
+            SELECT destination, currency, MAX(observed_at), COUNT(*)
+            FROM prices
+            WHERE origin = ?
+        """
+        params: tuple = (origin,)
+        if destination:
+            sql += " AND destination = ?"
+            params += (destination,)
+        sql += " GROUP BY destination, currency ORDER BY MAX(observed_at)"
+
+        now = time.time()
+        return [
+            {
+                "destination": dest,
+                "currency": currency,
+                "last_seen_hours": round((now - last_seen) / 3600, 1),
+                "observations": count,
+            }
+            for dest, currency, last_seen, count in await self._query(sql, params)
+        ]
@@ -0,0 +1,154 @@
+"""
+Replay recorded tool calls (MCP_TRACE_FILE output) against a server.
+
+    python replay.py traces.jsonl flights_server.py
+    python replay.py traces.jsonl http://127.0.0.1:8000/mcp --speed 4
+    python replay.py traces.jsonl flights_server.py --stub --speed 0
+
+Calls start at their recorded offsets divided by --speed (0 sends them
+as fast as --concurrency allows). With --stub, a script target is run
+against a local Amadeus stand-in instead of the test environment; for
+an HTTP target, start that server with AMADEUS_BASE_URL pointing at
+amadeus_stub.py yourself.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+
+from fastmcp import Client
+from fastmcp.client.transports import PythonStdioTransport
+
+
+def load_trace(path: str, tools: set[str] = frozenset(), limit: int = 0) -> list[dict]:
+    calls = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if "tool" not in entry or (tools and entry["tool"] not in tools):
+                continue
+            calls.append(entry)
+            if limit and len(calls) >= limit:
+                break
+    calls.sort(key=lambda entry: entry.get("ts", 0))
+    return calls
+
+
+def start_stub(port: int, latency_ms: float) -> str:
+    import uvicorn
+    from amadeus_stub import create_stub_app
+
+    config = uvicorn.Config(create_stub_app(latency_ms), host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def replay(client: Client, calls: list[dict], speed: float, concurrency: int, prefix: str) -> list[dict]:
+    semaphore = asyncio.Semaphore(concurrency)
+    first_ts = calls[0].get("ts", 0) if calls else 0
+    started = time.monotonic()
+
+    async def run(entry: dict) -> dict:
+        if speed > 0:
+            await asyncio.sleep(max(0.0, started + (entry.get("ts", first_ts) - first_ts) / speed - time.monotonic()))
+
+        async with semaphore:
+            sent = time.perf_counter()
+            try:
+                result = await client.call_tool(prefix + entry["tool"], entry.get("arguments") or {}, raise_on_error=False)
+                ok = not result.is_error
+            except Exception:
+                ok = False
+            return {
+                "tool": entry["tool"],
+                "ok": ok,
+                "latency_ms": 1000 * (time.perf_counter() - sent),
+                "recorded_ms": entry.get("duration_ms"),
+            }
+
+    return await asyncio.gather(*(run(entry) for entry in calls))
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def summarize(results: list[dict], elapsed: float) -> dict:
+    by_tool = defaultdict(list)
+    for result in results:
+        by_tool[result["tool"]].append(result)
+
+    def stats(items: list[dict]) -> dict:
+        latencies = [item["latency_ms"] for item in items]
+        recorded = [item["recorded_ms"] for item in items if item["recorded_ms"] is not None]
+        return {
+            "calls": len(items),
+            "errors": sum(1 for item in items if not item["ok"]),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "recorded_p95_ms": round(percentile(recorded, 95), 1) if recorded else None,
+        }
+
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "throughput_per_s": round(len(results) / elapsed, 2) if elapsed else None,
+        "overall": stats(results),
+        "tools": {tool: stats(items) for tool, items in sorted(by_tool.items())},
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Replay recorded MCP tool calls")
+    parser.add_argument("trace", help="JSONL trace written via MCP_TRACE_FILE")
+    parser.add_argument("target", help="Server script path or HTTP URL")
+    parser.add_argument("--speed", type=float, default=1.0, help="Rate multiplier; 0 = no pacing")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--tool", action="append", default=[], help="Only replay this tool (repeatable)")
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--prefix", default="", help="Prepended to tool names, e.g. flights_")
+    parser.add_argument("--stub", action="store_true", help="Run a script target against a local Amadeus stand-in")
+    parser.add_argument("--stub-port", type=int, default=9000)
+    parser.add_argument("--stub-latency-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    calls = load_trace(args.trace, set(args.tool), args.limit)
+    if not calls:
+        sys.exit("No tool calls in trace")
+
+    target = args.target
+    if not target.startswith(("http://", "https://")):
+        # Stdio servers only inherit a minimal environment by default
+        env = dict(os.environ, AMADEUS_WARMUP="0")
+        if args.stub:
+            env["AMADEUS_BASE_URL"] = start_stub(args.stub_port, args.stub_latency_ms)
+            # Keep stub tokens and responses out of the shared on-disk store
+            env["AMADEUS_SHARED_STATE_DB"] = ""
+        env.pop("MCP_TRACE_FILE", None)
+        target = PythonStdioTransport(target, env=env, cwd=os.path.dirname(os.path.abspath(args.target)))
+    elif args.stub:
+        sys.exit("--stub only applies to script targets")
+
+    async with Client(target, timeout=300) as client:
+        started = time.monotonic()
+        results = await replay(client, calls, args.speed, args.concurrency, args.prefix)
+        elapsed = time.monotonic() - started
+
+    print(json.dumps(summarize(results, elapsed), indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from amadeus import get_airline_routes
+from deadline import gather_within_deadline
+from scheduler import SchedulerOverloaded
+
+# -------------------------------------------------
+# Config
+# -------------------------------------------------
+ROUTE_GRAPH_FILE = os.getenv(
+    "ROUTE_GRAPH_FILE",
+    str(Path(__file__).resolve().parent / "route_graph.json"),
+)
+
+# Airline networks change slowly; refetch after a week
+ROUTE_GRAPH_TTL = 7 * 24 * 60 * 60
+ROUTE_FETCH_CONCURRENCY = 5
+MAX_STOPS = 2
+
+
+class RouteGraph:
+    """
+    Airports connected by the carriers that serve them.
+
+    The destinations endpoint only says which places an airline serves,
+    so two places are linked when one carrier serves both. That is an
+    upper bound on the real network: a routing missing here cannot be
+    flown, which is what pruning before a flight-offers search needs.
+    """
+
+    def __init__(self, path: str = ROUTE_GRAPH_FILE):
+        self.path = path
+        self._served: dict[str, set[str]] = {}
+        self._carriers_at: dict[str, set[str]] = defaultdict(set)
+        self._fetched_at: dict[str, float] = {}
+        self._adjacency: dict[str, set[str]] = {}
+        self._load()
+
+    # -----------------------
+    # Building
+    # -----------------------
+    def add_airline(self, airline_code: str, destinations: list[str], fetched_at: Optional[float] = None) -> None:
+        airline_code = airline_code.upper()
+        for airport in self._served.get(airline_code, ()):
+            self._carriers_at[airport].discard(airline_code)
+
+        served = {code for code in destinations if code}
+        self._served[airline_code] = served
+        for airport in served:
+            self._carriers_at[airport].add(airline_code)
+        self._fetched_at[airline_code] = fetched_at or time.time()
+        self._adjacency.clear()
+
+    def stale(self, airline_codes: list[str]) -> list[str]:
+        cutoff = time.time() - ROUTE_GRAPH_TTL
+        return [code for code in dict.fromkeys(c.upper() for c in airline_codes)
+                if self._fetched_at.get(code, 0) < cutoff]
+
+    async def ensure(self, airline_codes: list[str], concurrency: int = ROUTE_FETCH_CONCURRENCY) -> dict:
+        """
+        Fetch destinations for carriers that are missing or stale,
+        concurrently, then persist the graph.
+        """
+        missing = self.stale(airline_codes)
+        semaphore = asyncio.Semaphore(concurrency)
+        errors = {}
+
+        async def fetch(code: str):
+            async with semaphore:
+                try:
+                    data = await get_airline_routes(code)
+                except (httpx.HTTPError, SchedulerOverloaded) as e:
+                    errors[code] = str(e)
+                    return
+            self.add_airline(code, [item.get("iataCode") for item in data.get("data", [])])
+
+        def timed_out(index: int):
+            errors[missing[index]] = "Deadline exceeded"
+
+        await gather_within_deadline((fetch(code) for code in missing), timed_out)
+        if len(missing) > len(errors):
+            await asyncio.to_thread(self.save)
+
+        return {"fetched": len(missing) - len(errors), "errors": errors, **self.stats()}
+
+    def stats(self) -> dict:
+        return {"airlines": len(self._served), "airports": len(self._carriers_at)}
+
+    # -----------------------
+    # Persistence
+    # -----------------------
+    def save(self) -> None:
+        payload = {
+            code: {"fetched_at": self._fetched_at[code], "destinations": sorted(served)}
+            for code, served in self._served.items()
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for code, entry in payload.items():
+            self.add_airline(code, entry.get("destinations", []), entry.get("fetched_at"))
+
+    # -----------------------
+    # Queries
+    # -----------------------
+    def _leg_carriers(self, origin: str, destination: str) -> set[str]:
+        return self._carriers_at.get(origin, set()) & self._carriers_at.get(destination, set())
+
+    def _neighbors(self, airport: str) -> set[str]:
+        reachable = self._adjacency.get(airport)
+        if reachable is None:
+            reachable = set()
+            for carrier in self._carriers_at.get(airport, ()):
+                reachable |= self._served[carrier]
+            reachable.discard(airport)
+            self._adjacency[airport] = reachable
+        return reachable
+
+    def shortest_hops(self, origin: str, destination: str, max_stops: int = MAX_STOPS) -> Optional[int]:
+        """
+        Fewest flights needed (breadth-first), or None if unreachable
+        within max_stops connections.
+        """
+        origin, destination = origin.upper(), destination.upper()
+        if origin == destination:
+            return 0
+
+        frontier, seen = {origin}, {origin}
+        for hops in range(1, max_stops + 2):
+            next_frontier = set()
+            for airport in frontier:
+                next_frontier |= self._neighbors(airport)
+            if destination in next_frontier:
+                return hops
+            frontier = next_frontier - seen
+            seen |= frontier
+            if not frontier:
+                break
+        return None
+
+    def connections(self, origin: str, destination: str, max_stops: int = 1, k: int = 5) -> list[dict]:
+        """
+        Up to k feasible routings, fewest stops first, preferring
+        routings one carrier can fly end to end.
+        """
+        origin, destination = origin.upper(), destination.upper()
+        max_stops = min(max_stops, MAX_STOPS)
+
+        # Places from which the destination is one flight away
+        into_destination = self._neighbors(destination)
+        paths = []
+
+        if destination in self._neighbors(origin):
+            paths.append([origin, destination])
+
+        if max_stops >= 1:
+            for hub in self._neighbors(origin) & into_destination:
+                if hub != destination:
+                    paths.append([origin, hub, destination])
+
+        if max_stops >= 2 and len(paths) < k:
+            for first_hub in self._neighbors(origin) - {destination}:
+                for second_hub in self._neighbors(first_hub) & into_destination:
+                    if second_hub not in (origin, first_hub, destination):
+                        paths.append([origin, first_hub, second_hub, destination])
+
+        options = []
+        for path in paths:
+            legs = [sorted(self._leg_carriers(a, b)) for a, b in zip(path, path[1:])]
+            through = set(legs[0]).intersection(*legs[1:])
+            options.append({
+                "route": path,
+                "hubs": path[1:-1],
+                "carriers_per_leg": legs,
+                "single_carrier": sorted(through),
+            })
+
+        options.sort(key=lambda o: (len(o["route"]), not o["single_carrier"], -len(o["single_carrier"])))
+        return options[:k]
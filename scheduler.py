@@ -0,0 +1,194 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+from deadline import current_deadline
+
+# -------------------------------------------------
+# Priority classes (lower runs first)
+# -------------------------------------------------
+PRIORITY_BOOKING = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_BOOKING: "booking",
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BACKGROUND: "background",
+}
+
+# -------------------------------------------------
+# Limits
+# -------------------------------------------------
+# Amadeus self-service test environment allows 10 transactions per second
+RATE_LIMIT_PER_SECOND = float(os.getenv("AMADEUS_RATE_LIMIT", "10"))
+MAX_IN_FLIGHT = int(os.getenv("AMADEUS_MAX_IN_FLIGHT", "10"))
+
+# Background requests are shed once this many requests are already waiting
+SHED_QUEUE_DEPTH = int(os.getenv("AMADEUS_SHED_QUEUE_DEPTH", "20"))
+
+
+class SchedulerOverloaded(Exception):
+    pass
+
+
+_priority = contextvars.ContextVar("request_priority", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """
+    Run the enclosed upstream requests (and tasks created inside)
+    at the given priority.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+class RequestScheduler:
+    """
+    Single gate for upstream requests.
+
+    Waiting requests are ordered by priority, then by deadline, then by
+    arrival. Starts are paced by a token bucket at the upstream rate
+    limit. Background requests are rejected while the queue is deep.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = RATE_LIMIT_PER_SECOND,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        shed_queue_depth: int = SHED_QUEUE_DEPTH
+    ):
+        self.rate_per_second = rate_per_second
+        self.max_in_flight = max_in_flight
+        self.shed_queue_depth = shed_queue_depth
+
+        self._queue: list = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        # At least one request's worth, for per-worker shares under 1/s
+        self._burst = max(rate_per_second, 1.0)
+        self._tokens = self._burst
+        self._refilled_at = time.monotonic()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.started = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.shed = 0
+        self.expired = 0
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[int] = None, deadline: Optional[float] = None):
+        """
+        Wait for permission to send one request.
+        deadline is a time.monotonic() value, by default the caller's
+        deadline_scope(); requests still queued when it passes fail
+        with TimeoutError.
+        """
+        if priority is None:
+            priority = current_priority()
+        if deadline is None:
+            deadline = current_deadline()
+
+        if priority >= PRIORITY_BACKGROUND and len(self._queue) >= self.shed_queue_depth:
+            self.shed += 1
+            raise SchedulerOverloaded("Upstream is near its rate limit; background request dropped")
+
+        future = self._bind_loop().create_future()
+        heapq.heappush(
+            self._queue,
+            (priority, deadline if deadline is not None else float("inf"), next(self._sequence), future),
+        )
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted just before the cancel landed: give the slot back
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self._release()
+            raise
+
+        self.started[PRIORITY_NAMES.get(priority, "background")] += 1
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        # Waiters, slots and the wakeup timer belong to one event loop;
+        # a new loop (e.g. another asyncio.run) starts from a clean state
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = []
+            self._in_flight = 0
+            self._wakeup = None
+        return loop
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self.rate_per_second)
+        self._refilled_at = now
+
+    def _dispatch(self) -> None:
+        self._refill()
+        now = time.monotonic()
+
+        while self._queue and self._in_flight < self.max_in_flight:
+            _, deadline, _, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            if deadline < now:
+                heapq.heappop(self._queue)
+                self.expired += 1
+                future.set_exception(TimeoutError("Deadline passed while waiting for an upstream slot"))
+                continue
+            if self._tokens < 1:
+                self._schedule_wakeup((1 - self._tokens) / self.rate_per_second)
+                return
+
+            heapq.heappop(self._queue)
+            self._tokens -= 1
+            self._in_flight += 1
+            future.set_result(None)
+
+    def _schedule_wakeup(self, delay: float) -> None:
+        if self._wakeup is not None:
+            return
+
+        def wake():
+            self._wakeup = None
+            self._dispatch()
+
+        self._wakeup = asyncio.get_running_loop().call_later(delay, wake)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "queued": sum(1 for *_, future in self._queue if not future.done()),
+            "started": dict(self.started),
+            "shed": self.shed,
+            "expired": self.expired,
+        }
+
+
+scheduler = RequestScheduler()
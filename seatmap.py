@@ -0,0 +1,125 @@
+from collections import defaultdict
+
+# -------------------------------------------------
+# Seat status codes used in the compact grid
+# -------------------------------------------------
+STATUS_CODES = {
+    "AVAILABLE": "A",
+    "OCCUPIED": "O",
+    "BLOCKED": "B",
+}
+NO_SEAT = "_"
+UNKNOWN_STATUS = "?"
+
+
+def seatmap_key(seatmap: dict) -> str:
+    """
+    Identify one seatmap by its flight segment, e.g. 'AI101 DEL-BOM 2026-10-03T06:00:00'.
+    """
+    return (
+        f'{seatmap.get("carrierCode")}{seatmap.get("number")} '
+        f'{seatmap.get("departure", {}).get("iataCode")}-{seatmap.get("arrival", {}).get("iataCode")} '
+        f'{seatmap.get("departure", {}).get("at")}'
+    )
+
+
+def _split_seat_number(number: str) -> tuple[str, str]:
+    row = number.rstrip("ABCDEFGHJKLMNPQRSTUVWXYZ")
+    return row, number[len(row):]
+
+
+def _seat_status(seat: dict) -> str:
+    pricing = seat.get("travelerPricing") or [{}]
+    status = pricing[0].get("seatAvailabilityStatus")
+    return STATUS_CODES.get(status, UNKNOWN_STATUS)
+
+
+def _seat_price(seat: dict):
+    pricing = seat.get("travelerPricing") or [{}]
+    price = pricing[0].get("price")
+    if not price:
+        return None
+    return f'{price.get("total")} {price.get("currency")}'
+
+
+def compact_deck(deck: dict) -> dict:
+    """
+    Encode one deck as a row -> status string grid.
+    Each character is one column: A available, O occupied, B blocked, _ no seat.
+    Characteristics and prices are grouped into separate tables.
+    """
+    statuses = {}
+    columns = set()
+    seat_types = defaultdict(list)
+    prices = defaultdict(list)
+
+    for seat in deck.get("seats", []):
+        number = seat.get("number", "")
+        row, column = _split_seat_number(number)
+        if not row or not column:
+            continue
+
+        columns.add(column)
+        statuses[(row, column)] = _seat_status(seat)
+
+        codes = seat.get("characteristicsCodes")
+        if codes:
+            seat_types[" ".join(sorted(codes))].append(number)
+
+        price = _seat_price(seat)
+        if price:
+            prices[price].append(number)
+
+    column_order = "".join(sorted(columns))
+    rows = sorted({row for row, _ in statuses}, key=lambda row: (len(row), row))
+
+    grid = {
+        row: "".join(statuses.get((row, column), NO_SEAT) for column in column_order)
+        for row in rows
+    }
+
+    return {
+        "deck": deck.get("deckType"),
+        "cabin": (deck.get("seats") or [{}])[0].get("cabin"),
+        "columns": column_order,
+        "grid": grid,
+        "available": sum(row.count("A") for row in grid.values()),
+        "seat_types": [{"codes": codes.split(), "seats": " ".join(seats)} for codes, seats in seat_types.items()],
+        "prices": [{"price": price, "seats": " ".join(seats)} for price, seats in prices.items()],
+    }
+
+
+def compact_seatmap(seatmap: dict) -> dict:
+    return {
+        "segment": seatmap_key(seatmap),
+        "aircraft": seatmap.get("aircraft", {}).get("code"),
+        "decks": [compact_deck(deck) for deck in seatmap.get("decks", [])],
+    }
+
+
+def diff_seatmaps(old: dict, new: dict) -> dict:
+    """
+    Compare two compact seatmaps of the same segment.
+    Returns the seats whose status changed as {seat: [old, new]}.
+    """
+    changes = {}
+    old_decks = {deck["deck"]: deck for deck in old.get("decks", [])}
+
+    for deck in new.get("decks", []):
+        previous = old_decks.get(deck["deck"])
+        if previous is None:
+            continue
+
+        for row, statuses in deck["grid"].items():
+            before_row = previous["grid"].get(row, "")
+            for column, after in zip(deck["columns"], statuses):
+                index = previous["columns"].find(column)
+                before = before_row[index] if 0 <= index < len(before_row) else NO_SEAT
+                if before != after:
+                    changes[f"{row}{column}"] = [before, after]
+
+    return {
+        "segment": new.get("segment"),
+        "changed": changes,
+        "available": sum(deck["available"] for deck in new.get("decks", [])),
+    }
@@ -0,0 +1,74 @@
+"""
+Serve the flight and hotel tools over HTTP from several worker processes.
+
+    python serve.py --workers 4 --port 8000
+
+Tools are exposed at /mcp, prefixed "flights_" and "hotels_".
+Workers share the OAuth token and response cache through the SQLite
+file in AMADEUS_SHARED_STATE_DB (defaults to shared_state.db).
+
+Requests are stateless, so any worker can answer any call. State kept in
+process memory (flight watches, speculative prices, recent offer IDs)
+is per worker; run with --workers 1 if clients rely on it.
+
+The Amadeus rate limit (AMADEUS_RATE_LIMIT, 10 requests per second by
+default) and AMADEUS_MAX_IN_FLIGHT apply to the whole service: each
+worker's scheduler gets an equal share, so N workers together stay
+within the limit rather than sending N times as much.
+
+GET /ready answers 503 until the worker's startup warm-up has finished,
+so a load balancer can hold traffic back from cold workers.
+"""
+import argparse
+import os
+
+import uvicorn
+
+
+def create_app():
+    from fastmcp import FastMCP
+    from flights_server import mcp as flights_mcp
+    from hotels_server import mcp as hotels_mcp
+
+    from starlette.responses import JSONResponse
+    from tracing import enable_tracing
+    from warmup import warmup_status
+
+    server = FastMCP("amadeus-travel-mcp")
+    server.mount(flights_mcp, namespace="flights")
+    server.mount(hotels_mcp, namespace="hotels")
+    enable_tracing(server)
+
+    @server.custom_route("/ready", methods=["GET"])
+    async def ready(request):
+        status = warmup_status()
+        return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+    return server.http_app(path="/mcp", stateless_http=True, json_response=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Amadeus MCP tools over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    # Workers read their limits from the environment they inherit
+    workers = max(args.workers, 1)
+    rate = float(os.getenv("AMADEUS_RATE_LIMIT", "10"))
+    in_flight = int(os.getenv("AMADEUS_MAX_IN_FLIGHT", "10"))
+    os.environ["AMADEUS_RATE_LIMIT"] = str(rate / workers)
+    os.environ["AMADEUS_MAX_IN_FLIGHT"] = str(max(in_flight // workers, 1))
+
+    uvicorn.run(
+        "serve:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
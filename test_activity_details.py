@@ -0,0 +1,35 @@
+import asyncio
+import json
+from amadeus import search_activities, get_activities_by_ids
+
+
+async def main():
+    print(" Bulk Activity Details Test\n")
+
+    # Sandbox has activity data around Barcelona
+    latitude = 41.397158
+    longitude = 2.160873
+
+    search_response = await search_activities(latitude, longitude, radius=1)
+    activity_ids = [act["id"] for act in search_response.get("data", [])][:10]
+
+    if not activity_ids:
+        print(" No activities found (sandbox limitation).")
+        return
+
+    print(f"Fetching {len(activity_ids)} activities...\n")
+    results = await get_activities_by_ids(activity_ids)
+
+    for item in results:
+        if "error" in item:
+            print(f"{item['id']} | ERROR {item['error']}")
+        else:
+            print(f"{item['id']} | {item['data'].get('name')} | cached={item['cached']}")
+
+    print("\n Fetching again (should be served from cache)...\n")
+    results = await get_activities_by_ids(activity_ids)
+    print(json.dumps([{"id": r["id"], "cached": r.get("cached")} for r in results], indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+import asyncio
+from amadeus import search_multicity_india, price_flight_offers
+
+
+async def main():
+    print(" Searching flights first...\n")
+
+    search_response = await search_multicity_india()
+    offers = search_response.get("data", [])
+
+    if not offers:
+        print(" No flight offers found (sandbox limitation).")
+        return
+
+    print(f" Pricing {len(offers)} offers in one batch...\n")
+
+    results = await price_flight_offers(offers)
+    originals = {offer["id"]: offer["price"]["grandTotal"] for offer in offers}
+
+    for result in results:
+        if "error" in result:
+            print(f"Offer {result['id']} | ERROR {result['error']}")
+            continue
+
+        priced = result["priced"]
+        print(
+            f"Offer {result['id']} | "
+            f"searched {originals[result['id']]} -> "
+            f"priced {priced['price']['grandTotal']} {priced['price']['currency']}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
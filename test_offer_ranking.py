@@ -0,0 +1,52 @@
+from offer_ranking import rank_offers
+
+
+def offer(departure: str, arrival: str, total: str, carrier: str = "AI") -> dict:
+    return {
+        "itineraries": [{
+            "duration": "PT2H10M",
+            "segments": [{
+                "carrierCode": carrier,
+                "departure": {"iataCode": "DEL", "at": f"2026-11-01T{departure}:00"},
+                "arrival": {"iataCode": "BOM", "at": f"2026-11-01T{arrival}:00"},
+            }],
+        }],
+        "price": {"grandTotal": total},
+    }
+
+
+def main():
+    print(" Offer de-duplication (offline)\n")
+
+    # Two minutes apart, but on either side of a 06:30 boundary
+    result = rank_offers([offer("06:29", "08:39", "5200.00"), offer("06:31", "08:41", "5100.00", "UK")])
+    assert result["duplicates_removed"] == 1, result
+    assert result["ranked"][0]["index"] == 1, result
+    print(" 06:29 / 06:31 merged, cheaper one kept")
+
+    # 45 minutes apart
+    result = rank_offers([offer("06:00", "08:10", "5200.00"), offer("06:45", "08:55", "5100.00")])
+    assert result["duplicates_removed"] == 0, result
+    print(" 06:00 / 06:45 kept apart")
+
+    # Same departure, arrival an hour later: a different flight
+    result = rank_offers([offer("06:00", "08:10", "5200.00"), offer("06:10", "09:10", "5100.00")])
+    assert result["duplicates_removed"] == 0, result
+    print(" Same departure window, different arrival kept apart")
+
+    # Chained neighbours 20 minutes apart form one group
+    result = rank_offers([offer("06:00", "08:10", "5300.00"), offer("06:20", "08:30", "5200.00"),
+                          offer("06:40", "08:50", "5100.00")])
+    assert result["duplicates_removed"] == 2, result
+    assert result["ranked"][0]["index"] == 2, result
+    print(" Chained neighbours merged")
+
+    result = rank_offers([offer("06:29", "08:39", "5200.00"), offer("06:31", "08:41", "5100.00")], dedup=False)
+    assert result["duplicates_removed"] == 0 and len(result["ranked"]) == 2, result
+    print(" dedup=False keeps both")
+
+    print("\n All checks passed")
+
+
+if __name__ == "__main__":
+    main()
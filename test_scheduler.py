@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+from deadline import deadline_scope, gather_within_deadline
+from scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_BOOKING,
+    PRIORITY_INTERACTIVE,
+    RequestScheduler,
+    SchedulerOverloaded,
+)
+
+
+async def hold(scheduler: RequestScheduler, seconds: float, priority: int = PRIORITY_INTERACTIVE):
+    async with scheduler.slot(priority):
+        await asyncio.sleep(seconds)
+
+
+async def check_ordering():
+    scheduler = RequestScheduler(rate_per_second=1000, max_in_flight=1)
+    order = []
+
+    async def request(name: str, priority: int):
+        async with scheduler.slot(priority):
+            order.append(name)
+
+    blocker = asyncio.create_task(hold(scheduler, 0.05))
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.create_task(request("background", PRIORITY_BACKGROUND)),
+        asyncio.create_task(request("interactive", PRIORITY_INTERACTIVE)),
+        asyncio.create_task(request("booking", PRIORITY_BOOKING)),
+    ]
+    await asyncio.gather(blocker, *waiting)
+    assert order == ["booking", "interactive", "background"], order
+    print(" Waiting requests start by priority")
+
+
+async def check_shedding():
+    scheduler = RequestScheduler(rate_per_second=1000, max_in_flight=1, shed_queue_depth=2)
+    blocker = asyncio.create_task(hold(scheduler, 0.05))
+    await asyncio.sleep(0)
+    queued = [asyncio.create_task(hold(scheduler, 0)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    try:
+        async with scheduler.slot(PRIORITY_BACKGROUND):
+            raise AssertionError("background request was not shed")
+    except SchedulerOverloaded:
+        pass
+
+    # Interactive requests are never shed
+    await asyncio.gather(blocker, *queued, hold(scheduler, 0))
+    assert scheduler.shed == 1, scheduler.stats()
+    print(" Background requests shed on a deep queue")
+
+
+async def check_pacing():
+    scheduler = RequestScheduler(rate_per_second=20, max_in_flight=100)
+    started = time.monotonic()
+    await asyncio.gather(*(hold(scheduler, 0) for _ in range(30)))
+    elapsed = time.monotonic() - started
+    # 20 from the initial burst, 10 more at 20/s
+    assert 0.4 <= elapsed < 1.0, elapsed
+    print(f" 30 requests at 20/s took {elapsed:.2f}s")
+
+    slow = RequestScheduler(rate_per_second=0.5, max_in_flight=1)
+    started = time.monotonic()
+    await asyncio.gather(hold(slow, 0), hold(slow, 0))
+    assert 1.8 <= time.monotonic() - started < 2.5
+    print(" Rates under 1/s still make progress")
+
+
+async def check_deadline():
+    scheduler = RequestScheduler(rate_per_second=1000, max_in_flight=1)
+    blocker = asyncio.create_task(hold(scheduler, 0.3))
+    await asyncio.sleep(0)
+    try:
+        with deadline_scope(0.1):
+            async with scheduler.slot():
+                raise AssertionError("slot granted past the deadline")
+    except TimeoutError:
+        pass
+    await blocker
+    assert scheduler.stats()["in_flight"] == 0, scheduler.stats()
+
+    with deadline_scope(1.2):
+        results = await gather_within_deadline(
+            [asyncio.sleep(0, "fast"), asyncio.sleep(5, "slow")],
+            lambda index: "timed out",
+        )
+    assert results == ["fast", "timed out"], results
+    print(" Deadlines expire queued requests and cut gathers short")
+
+
+def check_event_loops():
+    # The module-level scheduler outlives each asyncio.run
+    scheduler = RequestScheduler(rate_per_second=5, max_in_flight=10)
+
+    async def burst(timeout: float):
+        await asyncio.wait_for(asyncio.gather(*(hold(scheduler, 0) for _ in range(7))), timeout)
+
+    # Leave requests queued and a wakeup pending when the loop ends
+    try:
+        asyncio.run(burst(0.1))
+    except asyncio.TimeoutError:
+        pass
+    for _ in range(2):
+        asyncio.run(burst(5))
+    print(" Scheduler keeps working across event loops")
+
+
+def main():
+    print(" Request scheduler (offline)\n")
+    asyncio.run(check_ordering())
+    asyncio.run(check_shedding())
+    asyncio.run(check_pacing())
+    asyncio.run(check_deadline())
+    check_event_loops()
+    print("\n All checks passed")
+
+
+if __name__ == "__main__":
+    main()
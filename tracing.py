@@ -0,0 +1,103 @@
+import contextvars
+import json
+import os
+import time
+from typing import Optional
+
+from fastmcp.server.middleware import Middleware
+
+from batch_writer import BatchWriter
+
+# -------------------------------------------------
+# Config
+# Set MCP_TRACE_FILE to record every tool call as one JSON line
+# -------------------------------------------------
+TRACE_FILE = os.getenv("MCP_TRACE_FILE")
+
+# Pending records are written after this delay, or as soon as the batch is full
+FLUSH_INTERVAL = 1.0
+FLUSH_BATCH_SIZE = 200
+
+
+class TraceWriter:
+    """
+    Append-only JSONL trace log.
+    Records are buffered in memory and appended in batches on a worker
+    thread, so tracing adds no file I/O to the tool call itself.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._batches = BatchWriter(self._append, FLUSH_INTERVAL, FLUSH_BATCH_SIZE)
+
+    def record(self, entry: dict) -> None:
+        self._batches.add(json.dumps(entry, separators=(",", ":"), default=str))
+
+    async def flush(self) -> None:
+        await self._batches.flush()
+
+    def _append(self, lines: list[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+_writer: Optional[TraceWriter] = None
+
+# Set while an outer server is already tracing this call (mounted servers)
+_tracing = contextvars.ContextVar("tracing", default=False)
+
+
+def get_trace_writer() -> Optional[TraceWriter]:
+    global _writer
+    if TRACE_FILE and _writer is None:
+        _writer = TraceWriter(TRACE_FILE)
+    return _writer
+
+
+def _result_size(result) -> int:
+    return sum(len(getattr(block, "text", "") or "") for block in getattr(result, "content", None) or [])
+
+
+class TraceMiddleware(Middleware):
+    """
+    Records tool name, arguments, start time, duration, outcome and
+    result size for every tool call. Only the outermost server records
+    a call, so mounted servers are not traced twice.
+    """
+
+    def __init__(self, server_name: str):
+        self.server_name = server_name
+
+    async def on_call_tool(self, context, call_next):
+        writer = get_trace_writer()
+        if writer is None or _tracing.get():
+            return await call_next(context)
+
+        token = _tracing.set(True)
+        entry = {
+            "ts": time.time(),
+            "server": self.server_name,
+            "tool": context.message.name,
+            "arguments": context.message.arguments or {},
+        }
+        started = time.perf_counter()
+        try:
+            result = await call_next(context)
+        except Exception as e:
+            entry.update(ok=False, error=type(e).__name__)
+            raise
+        else:
+            entry.update(ok=not getattr(result, "is_error", False), result_bytes=_result_size(result))
+            return result
+        finally:
+            _tracing.reset(token)
+            entry["duration_ms"] = round(1000 * (time.perf_counter() - started), 1)
+            writer.record(entry)
+
+
+def enable_tracing(mcp) -> None:
+    """
+    Attach the trace middleware to a FastMCP server when MCP_TRACE_FILE is set.
+    """
+    if TRACE_FILE:
+        mcp.add_middleware(TraceMiddleware(mcp.name))
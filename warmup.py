@@ -0,0 +1,118 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from amadeus import (
+    close_http_client,
+    get_access_token,
+    get_airline_name,
+    search_cities,
+)
+from deadline import deadline_scope
+from scheduler import PRIORITY_BACKGROUND, request_priority
+
+# -------------------------------------------------
+# Warm-up configuration
+# Disable with AMADEUS_WARMUP=0; lists are comma-separated
+# -------------------------------------------------
+WARMUP_ENABLED = os.getenv("AMADEUS_WARMUP", "1") not in ("0", "false", "no")
+
+
+def _env_list(name: str, default: str) -> list[str]:
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+WARMUP_AIRLINES = _env_list("WARMUP_AIRLINES", "AI,6E,UK,SG,EK,QR,SQ,LH,BA,AF")
+WARMUP_CITIES = _env_list("WARMUP_CITIES", "Delhi,Mumbai,Bangalore,Chennai,Goa,Paris,London")
+WARMUP_ROUTE_AIRLINES = _env_list("WARMUP_ROUTE_AIRLINES", "AI,6E,UK")
+
+# -------------------------------------------------
+# Readiness
+# -------------------------------------------------
+_ready = asyncio.Event()
+_task: Optional[asyncio.Task] = None
+_status = {"state": "pending", "started_at": None, "finished_at": None, "steps": {}}
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+async def wait_ready(timeout: Optional[float] = None) -> bool:
+    try:
+        await asyncio.wait_for(_ready.wait(), timeout)
+    except TimeoutError:
+        return False
+    return True
+
+
+def warmup_status() -> dict:
+    return {**_status, "ready": is_ready(), "steps": dict(_status["steps"])}
+
+
+async def _step(name: str, coro) -> None:
+    started = time.monotonic()
+    try:
+        await coro
+        _status["steps"][name] = {"ok": True}
+    except Exception as e:
+        # A failed step only means that data stays cold
+        _status["steps"][name] = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    _status["steps"][name]["ms"] = round(1000 * (time.monotonic() - started), 1)
+
+
+async def warm_up(route_graph=None) -> dict:
+    """
+    Fetch the OAuth token (which also opens the pooled connection),
+    then preload reference data so the first tool calls hit warm caches.
+    Runs at background priority without a deadline.
+    """
+    _status.update(state="running", started_at=time.time())
+
+    with request_priority(PRIORITY_BACKGROUND), deadline_scope(None, reset=True):
+        await _step("token", get_access_token())
+
+        preload = [_step("airlines", get_airline_name(WARMUP_AIRLINES))] if WARMUP_AIRLINES else []
+        preload += [_step(f"city:{city}", search_cities(city)) for city in WARMUP_CITIES]
+        if route_graph is not None and WARMUP_ROUTE_AIRLINES:
+            preload.append(_step("routes", route_graph.ensure(WARMUP_ROUTE_AIRLINES)))
+        await asyncio.gather(*preload)
+
+    _status.update(state="done", finished_at=time.time())
+    _ready.set()
+    return warmup_status()
+
+
+def start_warm_up(route_graph=None) -> None:
+    """
+    Start warm-up once per process; later calls are no-ops.
+    """
+    global _task
+    if _task is not None:
+        return
+    if not WARMUP_ENABLED:
+        _status["state"] = "disabled"
+        _ready.set()
+        return
+    _task = asyncio.create_task(warm_up(route_graph))
+
+
+def warmup_lifespan(route_graph=None):
+    """
+    FastMCP lifespan: start warm-up in the background as the server
+    starts (calls are served meanwhile) and close the pooled HTTP
+    client on shutdown.
+    """
+    @asynccontextmanager
+    async def lifespan(server):
+        start_warm_up(route_graph)
+        try:
+            yield {}
+        finally:
+            if _task is not None and not _task.done():
+                _task.cancel()
+            await close_http_client()
+
+    return lifespan